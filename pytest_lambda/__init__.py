@@ -2,5 +2,6 @@
 
 __version__ = '2.2.1'
 
+from .background import *
 from .fixtures import *
 from .util import *
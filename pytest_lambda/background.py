@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from typing import Any, Awaitable, Optional, TypeVar
+
+import wrapt  # type: ignore[import]
+
+__all__ = ['run_in_background_loop', 'background_proxy']
+
+
+T = TypeVar('T')
+
+#: Values of these types aren't bound to an event loop, so they're never proxied
+_UNPROXIED_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+class BackgroundEventLoop:
+    """An asyncio event loop running forever in a daemon thread
+
+    Awaitables may be submitted from any thread. As the loop outlives the event
+    loops of pytest-asyncio (which may be recreated for each test), values bound to
+    it — e.g. connection pools — remain usable for as long as the test session.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._run, name='pytest-lambda-event-loop', daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    @property
+    def is_current(self) -> bool:
+        """Whether the calling thread is the one running the loop"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, awaitable: Awaitable[T]) -> concurrent.futures.Future[T]:
+        if os.getpid() != self.pid:
+            # A forked child inherits the loop, but not the thread running it, so
+            # the awaitable would never be run
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise RuntimeError(
+                'The background event loop was started in another process (e.g. before '
+                'forking for a fork_fixture); values bound to it cannot be used here.')
+        return asyncio.run_coroutine_threadsafe(_await(awaitable), self.loop)
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """Await awaitable on the loop, blocking until its result is available"""
+        if self.is_current:
+            raise RuntimeError(
+                'Cannot block on the background event loop from within its own thread. '
+                'Await the awaitable, instead.')
+        return self.submit(awaitable).result()
+
+    def close(self) -> None:
+        if self.loop.is_closed():
+            return
+
+        async def shutdown():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.loop.shutdown_asyncgens()
+
+        self.run(shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class BackgroundLoopProxy(wrapt.ObjectProxy):
+    """Proxy to a value bound to the background event loop, usable from any thread
+
+    Awaitables returned by the value's methods are awaited on the background loop.
+    From sync code, calls block until the result is available; from async code
+    (e.g. a test running in pytest-asyncio's loop), calls return an awaitable of
+    the result, which must be awaited. Within the background loop itself, the
+    awaitables are returned untouched.
+
+    Results (other than plain values, e.g. ints and strs) are proxied in turn, as
+    are async context managers and iterators returned by methods, whose __aenter__,
+    __aexit__, and __anext__ are awaited on the background loop, too.
+    """
+
+    def __init__(self, wrapped: Any, background_loop: BackgroundEventLoop):
+        super().__init__(wrapped)
+        self._self_background_loop = background_loop
+
+    def __getattr__(self, name: str) -> Any:
+        value = super().__getattr__(name)
+        if callable(value) and not isinstance(value, type):
+            return _BackgroundLoopMethod(value, self._self_background_loop)
+        return value
+
+    def __call__(self, *args, **kwargs):
+        result = self.__wrapped__(*args, **kwargs)
+        return _resolve(self._self_background_loop, result)
+
+    async def __aenter__(self):
+        return await _await_in_background(
+            self._self_background_loop, self.__wrapped__.__aenter__())
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return await _await_in_background(
+            self._self_background_loop, self.__wrapped__.__aexit__(exc_type, exc_value, traceback))
+
+    def __aiter__(self):
+        iterator = self.__wrapped__.__aiter__()
+        if self._self_background_loop.is_current:
+            return iterator
+        return _proxy(self._self_background_loop, iterator)
+
+    def __anext__(self):
+        return _await_in_background(self._self_background_loop, self.__wrapped__.__anext__())
+
+    def __repr__(self) -> str:
+        return f'<BackgroundLoopProxy of {self.__wrapped__!r}>'
+
+
+class _BackgroundLoopMethod:
+    def __init__(self, method, background_loop: BackgroundEventLoop):
+        self.method = method
+        self.background_loop = background_loop
+
+    def __call__(self, *args, **kwargs):
+        result = self.method(*args, **kwargs)
+        return _resolve(self.background_loop, result)
+
+    def __repr__(self) -> str:
+        return f'<BackgroundLoopProxy of {self.method!r}>'
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+async def _await_proxied(background_loop: BackgroundEventLoop, awaitable: Awaitable[T]) -> T:
+    return _proxy(background_loop, await awaitable)
+
+
+async def _await_in_background(background_loop: BackgroundEventLoop, awaitable: Awaitable[T]) -> T:
+    """Await awaitable on the background loop, from within any running event loop"""
+    if background_loop.is_current:
+        return await awaitable
+    return await asyncio.wrap_future(background_loop.submit(_await_proxied(background_loop, awaitable)))
+
+
+def _resolve(background_loop: BackgroundEventLoop, result):
+    if background_loop.is_current:
+        return result
+
+    if not _is_awaitable(result):
+        if _is_async_protocol(result):
+            return _proxy(background_loop, result)
+        return result
+
+    future = background_loop.submit(_await_proxied(background_loop, result))
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return future.result()
+    else:
+        return asyncio.wrap_future(future)
+
+
+def _proxy(background_loop: BackgroundEventLoop, value: T) -> T:
+    if isinstance(value, _UNPROXIED_TYPES) or isinstance(value, BackgroundLoopProxy):
+        return value
+    return BackgroundLoopProxy(value, background_loop)  # type: ignore[return-value]
+
+
+def _is_awaitable(value) -> bool:
+    return asyncio.iscoroutine(value) or hasattr(type(value), '__await__')
+
+
+def _is_async_protocol(value) -> bool:
+    """Whether value is an async context manager or iterable"""
+    return hasattr(type(value), '__aenter__') or hasattr(type(value), '__aiter__')
+
+
+_background_loop: Optional[BackgroundEventLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Return the background event loop, starting it if necessary"""
+    global _background_loop
+    with _background_loop_lock:
+        # A forked child inherits the loop, but not the thread running it
+        if _background_loop is None or _background_loop.pid != os.getpid():
+            _background_loop = BackgroundEventLoop()
+        return _background_loop
+
+
+def close_background_loop() -> None:
+    """Cancel any tasks left on the background event loop, and stop it"""
+    global _background_loop
+    with _background_loop_lock:
+        background_loop, _background_loop = _background_loop, None
+
+    if background_loop is not None and background_loop.pid == os.getpid():
+        background_loop.close()
+
+
+class BackgroundLoopCloser:
+    """Stop the background event loop after the pytest session which started it
+
+    A loop started by an enclosing session (e.g. when running pytest in-process with
+    pytester) is left running for that session.
+    """
+
+    def __init__(self):
+        self.previous_loop = _background_loop
+
+    def pytest_unconfigure(self, config) -> None:
+        if _background_loop is not self.previous_loop:
+            close_background_loop()
+
+
+def run_in_background_loop(awaitable: Awaitable[T]) -> T:
+    """Await awaitable on the background event loop, blocking until it's done
+
+    Usage:
+
+        async def count_users(pool):
+            return await pool.fetchval('SELECT COUNT(*) FROM users')
+
+        def test_no_users(pool):
+            assert run_in_background_loop(count_users(pool)) == 0
+
+    """
+    return get_background_loop().run(awaitable)
+
+
+def background_proxy(value: T) -> T:
+    """Wrap a value bound to the background event loop, so it may be used from any thread
+
+    Values of lambda fixtures with background_loop=True are already wrapped. This is
+    useful for other loop-bound objects derived from them.
+
+    Usage:
+
+        conn = lambda_fixture(lambda pool: background_proxy(pool.acquire()), scope='session')
+
+        async def test_query(conn):
+            assert await conn.fetchval('SELECT 1') == 1
+
+    """
+    return _proxy(get_background_loop(), value)
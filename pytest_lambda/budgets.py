@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import pytest
+
+from pytest_lambda.costs import SetupCostRecorder, SetupSample
+from pytest_lambda.exceptions import FixtureBudgetExceededError
+from pytest_lambda.impl import LambdaFixture
+from pytest_lambda.workers import load_cached
+
+__all__ = ['LambdaFixtureBudgets']
+
+
+#: Cache key under which baseline medians are recorded with --lambda-baseline=record
+BASELINE_CACHE_KEY = 'pytest_lambda/baseline'
+
+# Baselines below these floors are rounded up before comparison, so that jitter in
+# near-instant fixtures isn't reported as a regression
+BASELINE_FLOOR_MS = 1.0
+BASELINE_FLOOR_BYTES = 1024
+
+
+class LambdaFixtureBudgets:
+    """Enforce setup budgets of lambda fixtures, and check them against a baseline
+
+    Per-fixture budgets are declared with lambda_fixture(budget_ms=..., budget_bytes=...),
+    and global defaults for all lambda fixtures with the lambda_budget_ms and
+    lambda_budget_bytes ini settings. A fixture exceeding its budget errors at setup.
+
+    With --lambda-baseline=record, the median setup costs of each fixture are
+    stored in the cache. With --lambda-baseline=check, the medians of the current
+    run are compared against the recorded baseline, and the session fails if any
+    fixture became slower/larger than --lambda-regression-ratio times its baseline.
+    """
+
+    def __init__(
+        self,
+        config: pytest.Config,
+        recorder: SetupCostRecorder,
+        *,
+        default_budget_ms: Optional[float] = None,
+        default_budget_bytes: Optional[int] = None,
+        baseline_mode: Optional[str] = None,
+        regression_ratio: float = 5.0,
+    ):
+        self.config = config
+        self.recorder = recorder
+        self.default_budget_ms = default_budget_ms
+        self.default_budget_bytes = default_budget_bytes
+        self.baseline_mode = baseline_mode
+        self.regression_ratio = regression_ratio
+
+        self.violations: List[str] = []
+        self.regressions: List[str] = []
+        self.baseline_recorded = 0
+
+        recorder.validators.append(self.enforce_budget)
+        if baseline_mode or default_budget_bytes is not None:
+            recorder.trace_memory()
+
+    def get_budgets(self, fixturedef) -> Tuple[Optional[float], Optional[int]]:
+        budget_ms = self.default_budget_ms
+        budget_bytes = self.default_budget_bytes
+
+        func = fixturedef.func
+        if isinstance(func, LambdaFixture):
+            if func.budget_ms is not None:
+                budget_ms = func.budget_ms
+            if func.budget_bytes is not None:
+                budget_bytes = func.budget_bytes
+
+        return budget_ms, budget_bytes
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        # Memory budgets can only be enforced while tracemalloc is tracing. Since
+        # budgets are declared on fixtures, this is only known once they're set up.
+        _, budget_bytes = self.get_budgets(fixturedef)
+        if budget_bytes is not None:
+            self.recorder.trace_memory()
+        yield
+
+    def enforce_budget(self, fixturedef, key: str, sample: SetupSample) -> None:
+        budget_ms, budget_bytes = self.get_budgets(fixturedef)
+
+        problems = []
+        if budget_ms is not None and sample.ms > budget_ms:
+            problems.append(f'setup took {sample.ms:.1f}ms (budget: {budget_ms:g}ms)')
+        if budget_bytes is not None and sample.bytes is not None and sample.bytes > budget_bytes:
+            problems.append(f'setup allocated {sample.bytes} bytes (budget: {budget_bytes} bytes)')
+
+        if problems:
+            msg = f'{key}: {", ".join(problems)}'
+            self.violations.append(msg)
+            raise FixtureBudgetExceededError(
+                f'Lambda fixture {fixturedef.argname!r} exceeded its budget: {msg}')
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session) -> None:
+        if not self.baseline_mode or hasattr(self.config, 'workeroutput'):
+            return
+
+        medians = self.recorder.medians()
+        if self.baseline_mode == 'record':
+            cache = getattr(self.config, 'cache', None)  # (None with -p no:cacheprovider)
+            if cache is not None:
+                cache.set(BASELINE_CACHE_KEY, medians)
+            self.baseline_recorded = len(medians)
+
+        elif self.baseline_mode == 'check':
+            baseline = load_cached(self.config, BASELINE_CACHE_KEY)
+            self.regressions = find_regressions(baseline, medians, self.regression_ratio)
+            if self.regressions and session.exitstatus == 0:
+                session.exitstatus = 1
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not (self.violations or self.regressions or self.baseline_recorded):
+            return
+
+        terminalreporter.write_sep('=', 'lambda fixture budgets')
+
+        if self.baseline_recorded:
+            terminalreporter.write_line(
+                f'recorded baseline setup costs of {self.baseline_recorded} lambda fixtures')
+
+        if self.violations:
+            terminalreporter.write_line('budgets exceeded:', bold=True)
+            for violation in self.violations:
+                terminalreporter.write_line(f'  {violation}', red=True)
+
+        if self.regressions:
+            terminalreporter.write_line(
+                f'regressions beyond {self.regression_ratio:g}x baseline:', bold=True)
+            for regression in self.regressions:
+                terminalreporter.write_line(f'  {regression}', red=True)
+
+
+def find_regressions(baseline: dict, medians: dict, ratio: float) -> List[str]:
+    """Describe each fixture whose median setup cost exceeds ratio times its baseline"""
+    regressions = []
+    for key, current in sorted(medians.items()):
+        previous = baseline.get(key)
+        if not previous:
+            continue
+
+        reference_ms = max(previous['ms'], BASELINE_FLOOR_MS)
+        if current['ms'] > reference_ms * ratio:
+            regressions.append(
+                f'{key}: median setup {current["ms"]:.1f}ms is '
+                f'{current["ms"] / reference_ms:.1f}x baseline of {previous["ms"]:.1f}ms')
+
+        if current.get('bytes') is not None and previous.get('bytes') is not None:
+            reference_bytes = max(previous['bytes'], BASELINE_FLOOR_BYTES)
+            if current['bytes'] > reference_bytes * ratio:
+                regressions.append(
+                    f'{key}: median setup allocation of {current["bytes"]} bytes is '
+                    f'{current["bytes"] / reference_bytes:.1f}x baseline of '
+                    f'{previous["bytes"]} bytes')
+
+    return regressions
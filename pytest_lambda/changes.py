@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import enum
+import functools
+import hashlib
+import os
+import sys
+import sysconfig
+from types import CodeType, FunctionType, MethodType, ModuleType
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pytest
+from _pytest.mark import ParameterSet
+
+from pytest_lambda.impl import LambdaFixture, LazyLambdaFixture
+from pytest_lambda.workers import WorkerOutputPlugin, load_cached
+
+__all__ = ['LambdaChangeSelector', 'CodeHasher', 'get_item_hash']
+
+
+#: Cache key under which the hash of each test which passed is stored
+PASSED_HASHES_CACHE_KEY = 'pytest_lambda/passed_hashes'
+
+#: Bytecode differs between interpreters, so hashes are only comparable within one
+_HASH_SALT = f'{sys.implementation.cache_tag}'
+
+#: Directories of the standard library and installed packages, whose modules aren't hashed
+_INSTALLED_PATHS = tuple(sorted({
+    os.path.join(os.path.abspath(sysconfig.get_paths()[key]), '')
+    for key in ('stdlib', 'platstdlib', 'purelib', 'platlib')
+}))
+
+#: How deeply nested containers (e.g. param values) are hashed
+_MAX_VALUE_DEPTH = 6
+
+
+class LambdaChangeSelector(WorkerOutputPlugin):
+    """Deselect tests whose code, and the code of all fixtures they use, is unchanged
+    since they last passed
+
+    Each test is hashed from the code objects of its function, of every fixture in
+    its closure (lambda fixtures hash the lambda they wrap, the codegen'd aliases and
+    destructured children, and their params), and of the module-level functions and
+    literal values these reference. The hashes of tests which pass are stored in the
+    cache; in later runs, tests whose hash matches are deselected.
+
+    Functions and values of imported modules are hashed, too, if the code references
+    them as module attributes (e.g. `app.compute(x)`). Changes to anything else the
+    code relies upon (e.g. attributes of classes, data files) are not detected.
+    """
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.previous = load_cached(config, PASSED_HASHES_CACHE_KEY)
+        self.hashes: Dict[str, str] = {}
+        self.passed: Dict[str, str] = {}
+        self.failed: Set[str] = set()
+        self.num_deselected: Optional[int] = None
+
+    def pytest_collection_modifyitems(self, session, config, items: List[pytest.Item]) -> None:
+        hasher = CodeHasher()
+        selected = []
+        deselected = []
+        for item in items:
+            digest = get_item_hash(item, hasher)
+            if digest is None:
+                selected.append(item)
+                continue
+
+            self.hashes[item.nodeid] = digest
+            if self.previous.get(item.nodeid) == digest:
+                deselected.append(item)
+            else:
+                selected.append(item)
+
+        self.num_deselected = len(deselected)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_report_collectionfinish(self, config, items):
+        if self.num_deselected is None:
+            return None
+        return (
+            f'lambda-changed: deselected {self.num_deselected} tests unchanged since '
+            f'they last passed'
+        )
+
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        digest = self.hashes.get(report.nodeid)
+        if digest is None:
+            return
+
+        if report.failed:
+            self.failed.add(report.nodeid)
+            self.passed.pop(report.nodeid, None)
+        elif report.when == 'call' and report.passed:
+            self.passed[report.nodeid] = digest
+
+    workeroutput_key = 'lambda_changed'
+
+    def get_worker_output(self) -> dict:
+        return {
+            'passed': self.passed,
+            'failed': sorted(self.failed),
+        }
+
+    def merge_worker_output(self, output: dict) -> None:
+        self.failed.update(output['failed'])
+        self.passed.update(output['passed'])
+
+    def store(self, session) -> None:
+        cache = getattr(self.config, 'cache', None)  # (None with -p no:cacheprovider)
+        if cache is not None and (self.passed or self.failed):
+            passed_hashes = load_cached(self.config, PASSED_HASHES_CACHE_KEY)
+            for nodeid in self.failed:
+                passed_hashes.pop(nodeid, None)
+            passed_hashes.update(self.passed)
+            cache.set(PASSED_HASHES_CACHE_KEY, passed_hashes)
+
+
+class CodeHasher:
+    """Compute stable hashes of functions and values, memoizing functions
+
+    Functions are hashed by their bytecode, constants, names, defaults, closure cells,
+    and the module-level values their code references (recursing into functions, and
+    into the attributes of referenced modules). Line numbers and filenames are
+    ignored, so moving code around doesn't alter its hash. Values other than
+    literals, containers, and callables are hashed by type.
+    """
+
+    def __init__(self):
+        # Functions are retained alongside their hashes, so their ids can't be reused
+        self._function_hashes: Dict[int, Tuple[FunctionType, str]] = {}
+
+    def hash_function(self, func: FunctionType) -> str:
+        key = id(func)
+        if key in self._function_hashes:
+            return self._function_hashes[key][1]
+
+        # Guard against recursion, e.g. from recursive functions
+        self._function_hashes[key] = (func, f'<recursive {func.__qualname__}>')
+
+        parts = [self.hash_code(func.__code__, func.__globals__)]
+        parts.extend(self.hash_value(default) for default in func.__defaults__ or ())
+        parts.extend(
+            f'{name}={self.hash_value(default)}'
+            for name, default in sorted((func.__kwdefaults__ or {}).items())
+        )
+        for cell in func.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:  # empty cell
+                parts.append('<empty>')
+            else:
+                parts.append(self.hash_value(contents))
+
+        digest = _digest(parts)
+        self._function_hashes[key] = (func, digest)
+        return digest
+
+    def hash_code(self, code: CodeType, globals_: Dict[str, Any]) -> str:
+        parts = [
+            code.co_code.hex(),
+            repr(code.co_names),
+            repr(code.co_varnames),
+            repr(code.co_freevars),
+            repr(code.co_cellvars),
+            repr((code.co_argcount, code.co_kwonlyargcount, code.co_flags)),
+        ]
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                parts.append(self.hash_code(const, globals_))
+            else:
+                parts.append(self.hash_value(const))
+
+        # NOTE: co_names includes attribute names, too, so some unrelated globals
+        #       may be hashed. This only errs on the side of rerunning tests.
+        for name in code.co_names:
+            if name not in globals_:
+                continue
+
+            value = globals_[name]
+            if isinstance(value, ModuleType):
+                parts.append(f'{name}={self.hash_module(value, code.co_names)}')
+            else:
+                parts.append(f'{name}={self.hash_value(value)}')
+
+        return _digest(parts)
+
+    def hash_module(self, module: ModuleType, names: Tuple[str, ...], depth: int = 0) -> str:
+        """Hash the attributes of a module which code may reference, by their names
+
+        As attribute accesses aren't resolved, the module's attributes sharing any
+        name the code references (its co_names) are hashed, e.g. the function of
+        `app.compute(x)`. Submodules (e.g. `app.utils.compute(x)`) are hashed alike.
+
+        Modules of the standard library and installed packages are hashed by name
+        only, as they aren't expected to change between runs (and their state, such
+        as sys.modules, would make hashes unstable).
+        """
+        if depth >= _MAX_VALUE_DEPTH or is_installed_module(module):
+            return f'<module {module.__name__}>'
+
+        namespace = vars(module)
+        parts = [f'<module {module.__name__}>']
+        for name in names:
+            if name not in namespace:
+                continue
+
+            value = namespace[name]
+            if isinstance(value, ModuleType):
+                parts.append(f'{name}={self.hash_module(value, names, depth + 1)}')
+            else:
+                parts.append(f'{name}={self.hash_value(value)}')
+
+        return _digest(parts)
+
+    def hash_value(self, value: Any, depth: int = 0) -> str:
+        if value is None or isinstance(value, (bool, int, float, complex, str, bytes, enum.Enum)):
+            return repr(value)
+
+        if depth >= _MAX_VALUE_DEPTH:
+            return f'<{type(value).__qualname__}>'
+
+        if isinstance(value, LambdaFixture):
+            fixture_func = value.fixture_func
+            params = value.fixture_kwargs.get('params')
+            if isinstance(value, LazyLambdaFixture):
+                params = value.lazy_params
+            return _digest([
+                'lambda_fixture',
+                repr(value.bind),
+                self.hash_value(fixture_func, depth + 1),
+                self.hash_value(params, depth + 1),
+            ])
+
+        if isinstance(value, FunctionType):
+            return self.hash_function(value)
+        if isinstance(value, MethodType):
+            if isinstance(value.__self__, LambdaFixture):
+                # e.g. the build_param of lazy fixtures, whose factories must be hashed
+                return _digest([
+                    self.hash_value(value.__func__, depth + 1),
+                    self.hash_value(value.__self__, depth + 1),
+                ])
+            return self.hash_value(value.__func__, depth + 1)
+        if isinstance(value, functools.partial):
+            return _digest([
+                'partial',
+                self.hash_value(value.func, depth + 1),
+                self.hash_value(value.args, depth + 1),
+                self.hash_value(value.keywords, depth + 1),
+            ])
+
+        if isinstance(value, ParameterSet):
+            return _digest(['param', self.hash_value(value.values, depth + 1), repr(value.id)])
+        if isinstance(value, (tuple, list)):
+            return _digest([type(value).__name__] + [self.hash_value(v, depth + 1) for v in value])
+        if isinstance(value, (set, frozenset)):
+            return _digest([type(value).__name__] + sorted(self.hash_value(v, depth + 1) for v in value))
+        if isinstance(value, dict):
+            return _digest([type(value).__name__] + sorted(
+                f'{self.hash_value(k, depth + 1)}:{self.hash_value(v, depth + 1)}'
+                for k, v in value.items()
+            ))
+
+        if isinstance(value, type):
+            return f'<class {value.__module__}.{value.__qualname__}>'
+        return f'<{type(value).__module__}.{type(value).__qualname__}>'
+
+
+def get_item_hash(item: pytest.Item, hasher: CodeHasher) -> Optional[str]:
+    """Hash the code of a test function and all the fixtures it uses
+
+    Returns None for items which aren't test functions (e.g. doctests), whose code
+    can't be hashed this way.
+    """
+    if not isinstance(item, pytest.Function):
+        return None
+
+    parts = [_HASH_SALT, hasher.hash_function(item.function)]
+
+    callspec = getattr(item, 'callspec', None)
+    item_params = callspec.params if callspec is not None else {}
+    parts.extend(
+        f'{argname}={hasher.hash_value(value)}'
+        for argname, value in sorted(item_params.items())
+    )
+
+    name2fixturedefs = item._fixtureinfo.name2fixturedefs
+    for argname in item.fixturenames:
+        # All overridden fixturedefs are hashed, as overriding fixtures may request them
+        for fixturedef in name2fixturedefs.get(argname, ()):
+            parts.append(':'.join((
+                argname,
+                fixturedef.baseid,
+                str(fixturedef.scope),
+                hasher.hash_value(fixturedef.func),
+                # Only the item's own param matters (pytest<8 also gives the params of
+                # @mark.parametrize to pseudo-fixturedefs, which would tie each test to
+                # the values of its siblings)
+                '' if argname in item_params else hasher.hash_value(fixturedef.params),
+            )))
+
+    return _digest(parts)
+
+
+def is_installed_module(module: ModuleType) -> bool:
+    """Whether module is builtin, or belongs to the standard library or an installed package"""
+    filename = getattr(module, '__file__', None)
+    if not filename:
+        return True
+    return os.path.abspath(filename).startswith(_INSTALLED_PATHS)
+
+
+def _digest(parts: List[str]) -> str:
+    return hashlib.sha256('\0'.join(parts).encode('utf-8', 'surrogatepass')).hexdigest()
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import pytest
+from _pytest.nodes import Node
+
+from pytest_lambda.impl import LambdaFixture, build_param_sets, get_fixture_key, is_lambda_fixture_func
+
+__all__ = [
+    'record_param_source',
+    'get_param_sources',
+    'get_param_index',
+    'get_param_indices',
+    'get_scope_node_id',
+    'iter_lambda_fixturedefs',
+    'get_dependent_fixturedefs',
+    'get_param_dependencies',
+    'get_higher_scoped_instances',
+]
+
+
+# Argnames parametrized by a param source, and the position of each param, keyed by
+# the ids of its values
+_ParamPositions = Tuple[Tuple[str, ...], Dict[Tuple[int, ...], int]]
+
+
+def _get_registry(config: pytest.Config) -> Dict[str, List[LambdaFixture]]:
+    registry = getattr(config, '_lambda_param_sources', None)
+    if registry is None:
+        registry = config._lambda_param_sources = {}  # type: ignore[attr-defined]
+    return registry
+
+
+def _get_definition_nodeid(item: pytest.Item) -> str:
+    originalname = getattr(item, 'originalname', None) or item.name
+    return f'{item.parent.nodeid}::{originalname}' if item.parent else originalname
+
+
+def _get_positions(config: pytest.Config) -> Dict[Tuple[str, int], _ParamPositions]:
+    positions = getattr(config, '_lambda_param_positions', None)
+    if positions is None:
+        positions = config._lambda_param_positions = {}  # type: ignore[attr-defined]
+    return positions
+
+
+def record_param_source(
+    metafunc,
+    param_source: LambdaFixture,
+    argnames: Sequence[str],
+    params: Iterable,
+    ids: Iterable | Callable[[Any], object | None] | None,
+) -> None:
+    """Remember that a test function was parametrized by a destructured lambda fixture
+
+    When a test is parametrized directly by argnames, pytest replaces the FixtureDefs
+    of those argnames with pseudo-fixtures, so the lambda fixture providing the params
+    can no longer be found through the collected items. This registry retains it.
+
+    The position of each param within params is recorded, too, keyed by the identity
+    of its values (see get_param_index).
+    """
+    definition = metafunc.definition
+    nodeid = f'{definition.parent.nodeid}::{definition.name}' if definition.parent else definition.name
+    sources = _get_registry(metafunc.config).setdefault(nodeid, [])
+    if param_source not in sources:
+        sources.append(param_source)
+
+    positions: Dict[Tuple[int, ...], int] = {}
+    for index, param_set in enumerate(build_param_sets(params, ids, tuple(argnames))):
+        positions.setdefault(tuple(map(id, param_set.values)), index)
+    _get_positions(metafunc.config)[nodeid, id(param_source)] = (tuple(argnames), positions)
+
+
+def get_param_sources(item: pytest.Item) -> List[LambdaFixture]:
+    """Return the destructured parametrized lambda fixtures which parametrized item"""
+    if not hasattr(item, 'callspec'):
+        return []
+    return _get_registry(item.config).get(_get_definition_nodeid(item), [])
+
+
+def get_param_index(item: pytest.Item, param_source: LambdaFixture) -> Optional[int]:
+    """Return the position within param_source's params of the param item received
+
+    callspec.indices can't be relied upon for this: before pytest 8.0, the indices
+    of args parametrized directly at a higher scope were renumbered for each test.
+    """
+    callspec = getattr(item, 'callspec', None)
+    entry = _get_positions(item.config).get((_get_definition_nodeid(item), id(param_source)))
+    if callspec is None or entry is None:
+        return None
+
+    argnames, positions = entry
+    values = {**getattr(callspec, 'funcargs', {}), **callspec.params}
+    if not all(argname in values for argname in argnames):
+        return None
+    return positions.get(tuple(id(values[argname]) for argname in argnames))
+
+
+def get_param_indices(item: pytest.Item) -> Dict[str, int]:
+    """Return the index of the param of each argname item was parametrized by
+
+    The args of destructured param sources are given the position of their param
+    within the source's params (see get_param_index); others, their callspec index.
+    """
+    callspec = getattr(item, 'callspec', None)
+    if callspec is None:
+        return {}
+
+    indices = dict(callspec.indices)
+    for param_source in get_param_sources(item):
+        index = get_param_index(item, param_source)
+        if index is not None:
+            argnames, _ = _get_positions(item.config)[_get_definition_nodeid(item), id(param_source)]
+            indices.update(dict.fromkeys(argnames, index))
+    return indices
+
+
+def get_scope_node_id(item: pytest.Item, scope: Optional[str]) -> str:
+    """Return the nodeid of the collector bounding a fixture of the given scope"""
+    node: Optional[Node]
+    if scope == 'class':
+        node = item.getparent(pytest.Class)
+    elif scope == 'module':
+        node = item.getparent(pytest.Module)
+    elif scope == 'package':
+        node = item.getparent(getattr(pytest, 'Package', pytest.Module))
+    elif scope == 'function' or scope is None:
+        node = item
+    else:
+        node = None
+    return node.nodeid if node is not None else ''
+
+
+def iter_lambda_fixturedefs(item: pytest.Item) -> Iterable:
+    """Yield the active FixtureDef of each lambda fixture in item's fixture closure"""
+    name2fixturedefs = getattr(getattr(item, '_fixtureinfo', None), 'name2fixturedefs', {})
+    for argname in getattr(item, 'fixturenames', ()):
+        fixturedefs = name2fixturedefs.get(argname)
+        if fixturedefs and is_lambda_fixture_func(fixturedefs[-1].func):
+            yield fixturedefs[-1]
+
+
+def get_dependent_fixturedefs(item: pytest.Item, argnames: Iterable[str]) -> List:
+    """Return the FixtureDefs in item's closure which (transitively) request argnames"""
+    name2fixturedefs = getattr(getattr(item, '_fixtureinfo', None), 'name2fixturedefs', {})
+    targets = set(argnames)
+    memo: Dict[str, bool] = {}
+
+    def depends(argname: str, visiting: Set[str]) -> bool:
+        if argname in memo:
+            return memo[argname]
+
+        fixturedefs = name2fixturedefs.get(argname)
+        result = False
+        if fixturedefs and argname not in visiting:
+            visiting.add(argname)
+            result = any(
+                dependency in targets or depends(dependency, visiting)
+                for dependency in fixturedefs[-1].argnames
+            )
+            visiting.discard(argname)
+
+        memo[argname] = result
+        return result
+
+    return [
+        name2fixturedefs[argname][-1]
+        for argname in getattr(item, 'fixturenames', ())
+        if argname not in targets and depends(argname, set())
+    ]
+
+
+def get_param_dependencies(
+    item: pytest.Item,
+    fixturedef,
+    child_indices: Dict[str, Tuple[int, int]],
+) -> Iterator[Tuple[int, int]]:
+    """Yield (source id, param index) of each param source fixturedef transitively requests"""
+    name2fixturedefs = item._fixtureinfo.name2fixturedefs  # type: ignore[attr-defined]
+    seen = set()
+    pending = list(fixturedef.argnames)
+    while pending:
+        argname = pending.pop()
+        if argname in seen:
+            continue
+        seen.add(argname)
+
+        if argname in child_indices:
+            yield child_indices[argname]
+        elif name2fixturedefs.get(argname):
+            pending.extend(name2fixturedefs[argname][-1].argnames)
+
+
+def get_higher_scoped_instances(item: pytest.Item) -> List[Tuple[str, str, str]]:
+    """Identify the instance of each higher-scoped lambda fixture item would set up
+
+    Returns (fixture key, scope nodeid, param id) for each non-function-scoped lambda
+    fixture in item's closure. Two tests sharing all three share the same instance of
+    the fixture (assuming they run consecutively in the same process).
+    """
+    indices = get_param_indices(item)
+    name2fixturedefs = getattr(getattr(item, '_fixtureinfo', None), 'name2fixturedefs', {})
+
+    instances = []
+    for fixturedef in iter_lambda_fixturedefs(item):
+        if fixturedef.scope == 'function':
+            continue
+
+        # Find every parametrized argname the fixture transitively requests
+        seen = set()
+        pending = [fixturedef.argname]
+        while pending:
+            argname = pending.pop()
+            if argname in seen:
+                continue
+            seen.add(argname)
+            if name2fixturedefs.get(argname):
+                pending.extend(name2fixturedefs[argname][-1].argnames)
+
+        param_id = ','.join(
+            f'{argname}={indices[argname]}' for argname in sorted(seen) if argname in indices)
+        scope_node_id = get_scope_node_id(item, fixturedef.scope)
+        instances.append((get_fixture_key(fixturedef), scope_node_id, param_id))
+
+    return instances
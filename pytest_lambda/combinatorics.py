@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import itertools
+from typing import List, Optional, Sequence, Set, Tuple, Union
+
+__all__ = ['covering_array', 'parse_combine_strength']
+
+
+def parse_combine_strength(combine: Union[str, int, None]) -> Optional[int]:
+    """Convert a combine mode to an n-wise strength, or None for the full Cartesian product
+
+    Accepted modes are "product", "pairwise", or an integer strength (e.g. 3 or "3"),
+    where strength N covers every combination of params from any N param sources.
+    """
+    if combine is None or combine == 'product':
+        return None
+    if combine == 'pairwise':
+        return 2
+    try:
+        strength = int(combine)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f'Unknown combine mode {combine!r}. Expected "product", "pairwise", '
+            f'or an integer n-wise strength.') from None
+    if strength < 1:
+        raise ValueError(f'combine strength must be at least 1, not {strength}')
+    return strength
+
+
+def covering_array(sizes: Sequence[int], strength: int) -> List[Tuple[int, ...]]:
+    """Generate rows of value indices covering every strength-way combination of factors
+
+    For each set of `strength` factors, every combination of their values appears in
+    at least one row. The result is deterministic for the same sizes and strength.
+
+    The IPOG strategy is used: rows begin as the full product of the first `strength`
+    factors, then each further factor is added by assigning each existing row the
+    value covering the most uncovered combinations (horizontal growth), and then
+    adding rows for any combinations still uncovered (vertical growth).
+
+    >>> covering_array([2, 2], 2)
+    [(0, 0), (0, 1), (1, 0), (1, 1)]
+    >>> len(covering_array([3, 3, 3, 3], 2))  # (instead of the 81 of the full product)
+    10
+    """
+    num_factors = len(sizes)
+    if any(size == 0 for size in sizes):
+        return []
+    if strength >= num_factors:
+        return list(itertools.product(*(range(size) for size in sizes)))
+
+    # None marks a "don't care" value, which may be freely assigned later
+    rows: List[List[Optional[int]]] = [
+        list(values)
+        for values in itertools.product(*(range(size) for size in sizes[:strength]))
+    ]
+
+    for factor in range(strength, num_factors):
+        factor_sets = [
+            others + (factor,)
+            for others in itertools.combinations(range(factor), strength - 1)
+        ]
+        uncovered: Set[Tuple[Tuple[int, ...], Tuple[int, ...]]] = {
+            (factors, values)
+            for factors in factor_sets
+            for values in itertools.product(*(range(sizes[f]) for f in factors))
+        }
+
+        # Horizontal growth
+        for row in rows:
+            best_value = 0
+            best_covered: List[Tuple[Tuple[int, ...], Tuple[Optional[int], ...]]] = []
+            for value in range(sizes[factor]):
+                covered = []
+                for factors in factor_sets:
+                    values = tuple(value if f == factor else row[f] for f in factors)
+                    if (factors, values) in uncovered:
+                        covered.append((factors, values))
+                if len(covered) > len(best_covered):
+                    best_value, best_covered = value, covered
+            row.append(best_value)
+            uncovered.difference_update(best_covered)
+
+        # Vertical growth, filling in "don't care" values of rows where possible
+        for factors, values in sorted(uncovered):
+            for row in rows:
+                if all(row[f] is None or row[f] == v for f, v in zip(factors, values)):
+                    break
+            else:
+                row = [None] * (factor + 1)
+                rows.append(row)
+
+            for f, v in zip(factors, values):
+                row[f] = v
+
+    return [tuple(0 if value is None else value for value in row) for row in rows]
@@ -1,3 +1,5 @@
+import pytest
+
 try:
     from typing import TypedDict
 except ImportError:  # Python < 3.8
@@ -10,3 +12,28 @@ except ImportError:  # pytest<4
     class _PytestWrapper:  # type: ignore[no-redef]
         def __new__(cls, obj):
             return obj
+
+
+PYTEST_VERSION = tuple(int(part) for part in pytest.__version__.split('.')[:2] if part.isdigit())
+
+
+def cache_fixture_exception(fixturedef, exc: BaseException) -> None:
+    """Make a fixture which has already cached its value raise exc to later requests"""
+    if fixturedef.cached_result is None:
+        return
+
+    cache_key = fixturedef.cached_result[1]
+    if PYTEST_VERSION >= (8, 0):
+        fixturedef.cached_result = (None, cache_key, exc)
+    else:
+        # Older pytest versions store (and reraise) an exc_info tuple
+        fixturedef.cached_result = (None, cache_key, (type(exc), exc, exc.__traceback__))
+
+
+def force_hook_exception(outcome, exc: BaseException) -> None:
+    """Make an old-style hookwrapper's hook call raise exc"""
+    if hasattr(outcome, 'force_exception'):
+        outcome.force_exception(exc)
+    else:
+        # pluggy<1.1 propagates exceptions raised from hookwrappers as-is
+        raise exc
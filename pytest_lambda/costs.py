@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Generator, List, NamedTuple, Optional
+
+import pytest
+
+from pytest_lambda.compat import cache_fixture_exception, force_hook_exception
+from pytest_lambda.impl import get_fixture_key, is_lambda_fixture_func
+from pytest_lambda.workers import WorkerOutputPlugin, load_cached
+
+__all__ = ['SetupSample', 'SetupCostRecorder', 'summarize_samples']
+
+
+#: Cache key under which the median setup costs of the most recent run are stored
+SETUP_COSTS_CACHE_KEY = 'pytest_lambda/setup_costs'
+
+class SetupSample(NamedTuple):
+    #: Wall-clock time spent in the fixture's own setup, in milliseconds
+    ms: float
+    #: Memory allocated and retained by the fixture's own setup, if measured
+    bytes: Optional[int]
+
+
+SampleValidator = Callable[[object, str, SetupSample], None]
+
+
+class SetupCostRecorder(WorkerOutputPlugin):
+    """Measure the setup time (and optionally memory) of every lambda fixture
+
+    Only the fixture's own setup is measured: when a fixture's setup encloses the
+    setup of another fixture (as happens with dependencies on older pytest versions),
+    the nested setup's cost is subtracted from the enclosing one.
+
+    Memory is only measured while tracemalloc is tracing; see trace_memory().
+
+    Fixtures may be set up concurrently from multiple threads: nesting is tracked per
+    thread. (As tracemalloc's counters are process-wide, memory measured while other
+    threads allocate is not attributable to one fixture.)
+    """
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.samples: Dict[str, List[SetupSample]] = {}
+        self.scopes: Dict[str, str] = {}
+        self.validators: List[SampleValidator] = []
+
+        #: Whether samples of this run should be saved to the cache at session end
+        self.persist = False
+
+        # Per-thread stack of [start_time, start_bytes, nested_ms, nested_bytes] for in-progress setups
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    @property
+    def _stack(self) -> List[List]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def trace_memory(self) -> None:
+        """Begin measuring memory allocated by fixture setups"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request) -> Generator[None, Any, None]:
+        is_lambda = is_lambda_fixture_func(fixturedef.func)
+        stack = self._stack
+        if not is_lambda and not stack:
+            yield
+            return
+
+        tracing = tracemalloc.is_tracing()
+        frame = [
+            time.perf_counter(),
+            tracemalloc.get_traced_memory()[0] if tracing else 0,
+            0.0,
+            0,
+        ]
+        stack.append(frame)
+        try:
+            outcome = yield
+        finally:
+            stack.pop()
+
+        elapsed_ms = (time.perf_counter() - frame[0]) * 1000
+        allocated = tracemalloc.get_traced_memory()[0] - frame[1] if tracing else 0
+
+        if stack:
+            parent = stack[-1]
+            parent[2] += elapsed_ms
+            parent[3] += allocated
+
+        if not is_lambda:
+            return
+
+        sample = SetupSample(
+            ms=max(elapsed_ms - frame[2], 0.0),
+            bytes=int(max(allocated - frame[3], 0)) if tracing else None,
+        )
+
+        key = get_fixture_key(fixturedef)
+        with self._lock:
+            self.samples.setdefault(key, []).append(sample)
+            self.scopes[key] = fixturedef.scope
+
+        if outcome.excinfo is None:
+            for validator in self.validators:
+                try:
+                    validator(fixturedef, key, sample)
+                except Exception as e:
+                    # pytest has already cached the fixture's value; later requests of
+                    # higher-scoped fixtures must raise the error, too
+                    cache_fixture_exception(fixturedef, e)
+                    force_hook_exception(outcome, e)
+                    break
+
+    workeroutput_key = 'lambda_setup_samples'
+
+    def get_worker_output(self) -> dict:
+        return {
+            key: (self.scopes[key], [tuple(s) for s in samples])
+            for key, samples in self.samples.items()
+        }
+
+    def merge_worker_output(self, output: dict) -> None:
+        for key, (scope, samples) in output.items():
+            self.scopes[key] = scope
+            self.samples.setdefault(key, []).extend(SetupSample(*s) for s in samples)
+
+    def store(self, session) -> None:
+        cache = getattr(self.config, 'cache', None)  # (None with -p no:cacheprovider)
+        if self.persist and self.samples and cache is not None:
+            costs = load_cached(self.config, SETUP_COSTS_CACHE_KEY)
+            costs.update(summarize_samples(self.samples, self.scopes))
+            cache.set(SETUP_COSTS_CACHE_KEY, costs)
+
+    def pytest_unconfigure(self, config) -> None:
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    def medians(self) -> Dict[str, dict]:
+        return summarize_samples(self.samples, self.scopes)
+
+
+def summarize_samples(
+    samples: Dict[str, List[SetupSample]],
+    scopes: Dict[str, str],
+) -> Dict[str, dict]:
+    """Reduce setup samples to their JSON-serializable per-fixture medians"""
+    summary = {}
+    for key, key_samples in samples.items():
+        measured_bytes = [s.bytes for s in key_samples if s.bytes is not None]
+        summary[key] = {
+            'ms': statistics.median(s.ms for s in key_samples),
+            'bytes': int(statistics.median(measured_bytes)) if measured_bytes else None,
+            'scope': scopes.get(key, 'function'),
+            'count': len(key_samples),
+        }
+    return summary
+
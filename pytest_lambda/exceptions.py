@@ -1,4 +1,4 @@
-__all__ = ['DisabledFixtureError', 'NotImplementedFixtureError']
+__all__ = ['DisabledFixtureError', 'NotImplementedFixtureError', 'FixtureBudgetExceededError']
 
 
 class DisabledFixtureError(Exception):
@@ -13,3 +13,10 @@ class NotImplementedFixtureError(NotImplementedError):
 
     See pytest_lambda.fixtures.not_implemented_fixture
     """
+
+
+class FixtureBudgetExceededError(Exception):
+    """Thrown when the setup of a lambda fixture exceeds its time or memory budget
+
+    See the budget_ms and budget_bytes params of pytest_lambda.fixtures.lambda_fixture
+    """
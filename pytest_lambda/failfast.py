@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import inspect
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import pytest
+
+from pytest_lambda.exceptions import NotImplementedFixtureError
+from pytest_lambda.impl import LambdaFixture
+
+__all__ = ['LambdaFailFast', 'find_static_errors']
+
+
+class LambdaFailFast:
+    """Fail tests using disabled or unimplemented fixtures before any setup is run
+
+    Normally, the error of a disabled_fixture or not_implemented_fixture is only
+    raised once pytest reaches it during setup — after setting up every fixture
+    sorted before it, which may be expensive (e.g. database fixtures). As their
+    errors are known ahead of time, the fixture closure of each test is checked at
+    collection instead:
+
+     - Tests of abstract classes — those which are subclassed, or nested within a
+       subclassed class — are deselected, if they reach unimplemented fixtures
+     - Other tests reaching disabled or unimplemented fixtures raise the fixture's
+       error at the start of setup, without setting up any fixtures
+
+    Fixtures requested dynamically (with request.getfixturevalue) aren't part of the
+    closure, so they still raise during setup, as usual.
+    """
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.errors: Dict[pytest.Item, Exception] = {}
+        self.num_abstract: Optional[int] = None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, session, config, items: List[pytest.Item]) -> None:
+        selected = []
+        deselected = []
+        for item in items:
+            errors = find_static_errors(item)
+            if not errors:
+                selected.append(item)
+            elif is_abstract(item) and all(isinstance(e, NotImplementedFixtureError) for e in errors):
+                deselected.append(item)
+            else:
+                self.errors[item] = errors[0]
+                selected.append(item)
+
+        self.num_abstract = len(deselected)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    def pytest_report_collectionfinish(self, config, items):
+        if not self.num_abstract and not self.errors:
+            return None
+        return (
+            f'lambda-failfast: deselected {self.num_abstract} tests of abstract classes; '
+            f'{len(self.errors)} tests use disabled or unimplemented fixtures'
+        )
+
+    # NOTE: this runs after the tryfirst impl of the skipping plugin, so xfail marks
+    #       still apply, but before the runner's impl sets up any fixtures.
+    def pytest_runtest_setup(self, item: pytest.Item) -> None:
+        error = self.errors.get(item)
+        if error is not None:
+            raise error
+
+    def has_error(self, item: pytest.Item) -> bool:
+        return item in self.errors
+
+
+def find_static_errors(item: pytest.Item) -> List[Exception]:
+    """Return the errors of disabled/unimplemented fixtures in the closure of item
+
+    The errors are ordered as the fixtures in the closure.
+    """
+    fixtureinfo = getattr(item, '_fixtureinfo', None)
+    if fixtureinfo is None:
+        return []
+
+    errors = []
+    for argname in getattr(item, 'fixturenames', ()):
+        fixturedefs = fixtureinfo.name2fixturedefs.get(argname)
+        if not fixturedefs:
+            continue
+
+        for fixturedef in _iter_reachable_fixturedefs(argname, fixturedefs):
+            func = fixturedef.func
+            if isinstance(func, LambdaFixture) and func.static_error is not None:
+                errors.append(func.static_error(argname))
+                break
+
+    return errors
+
+
+def _iter_reachable_fixturedefs(argname: str, fixturedefs: Sequence) -> Iterator:
+    """Yield the overriding fixturedef of argname, and any it overrides and requests"""
+    for fixturedef in reversed(fixturedefs):
+        yield fixturedef
+        if argname not in fixturedef.argnames:
+            break
+
+
+def is_abstract(item: pytest.Item) -> bool:
+    """Whether item belongs to a class which is subclassed, or nested within one"""
+    for node in item.listchain():
+        if isinstance(node, pytest.Class) and inspect.isclass(node.obj) \
+                and node.obj.__subclasses__():
+            return True
+    return False
@@ -4,13 +4,14 @@ import inspect
 from typing import NoReturn, TYPE_CHECKING, Callable, Any, Iterable, Tuple, TypeVar
 
 from pytest_lambda.exceptions import DisabledFixtureError, NotImplementedFixtureError
-from pytest_lambda.impl import LambdaFixture
+from pytest_lambda.impl import BatchLambdaFixture, ForkLambdaFixture, LambdaFixture, LazyLambdaFixture
 
 if TYPE_CHECKING:
-    from _pytest.fixtures import _Scope
+    from pytest_lambda.types import _Scope
 
 __all__ = ['lambda_fixture', 'static_fixture', 'error_fixture',
-           'disabled_fixture', 'not_implemented_fixture']
+           'disabled_fixture', 'not_implemented_fixture', 'batch_fixture',
+           'fork_fixture']
 
 
 VT = TypeVar('VT')
@@ -21,11 +22,16 @@ def lambda_fixture(
     *other_fixture_names: str,
     bind: bool = False,
     async_: bool = False,
+    background_loop: bool = False,
     scope: _Scope = 'function',
     params: Iterable[object] | None = None,
     autouse: bool = False,
     ids: Iterable[None | str | float | int | bool] | Callable[[Any], object | None] | None = None,
     name: str | None = None,
+    budget_ms: float | None = None,
+    budget_bytes: int | None = None,
+    combine: str | int | None = None,
+    lazy: bool = False,
 ) -> LambdaFixture[VT]:
     """Use a fixture name or lambda function to compactly declare a fixture
 
@@ -50,6 +56,14 @@ def lambda_fixture(
         awaitable value, it will be awaited. If False, the lambda's return value will be returned
         verbatim, regardless of whether it's awaitable.
 
+    :param background_loop:
+        If True, the lambda is awaited (as with async_=True) on a single long-lived event
+        loop, running in a background thread for the whole test session, rather than the
+        loop of any asyncio plugin. This allows expensive async clients/pools to be created
+        once, at a higher scope. The fixture's value is wrapped in a proxy, which awaits
+        the awaitables its methods return on the background loop: blocking in sync code,
+        or returning an awaitable to be awaited in async code.
+
     :param scope:
     :param params:
     :param autouse:
@@ -57,6 +71,30 @@ def lambda_fixture(
     :param name:
         Options to pass to pytest.fixture()
 
+    :param budget_ms:
+        If specified, setting up the fixture must take no longer than this many
+        milliseconds, or an error is raised. Overrides the lambda_budget_ms ini setting.
+
+    :param budget_bytes:
+        If specified, the memory allocated (and retained) by the fixture's setup must not
+        exceed this many bytes, or an error is raised. Overrides the lambda_budget_bytes
+        ini setting. Memory is measured with tracemalloc, which is started on demand.
+
+    :param combine:
+        How tests using multiple destructured parametrized lambda fixtures combine their
+        params: "product" (the full Cartesian product), "pairwise", or an integer N to
+        cover every combination of params from any N of the fixtures. Overrides the
+        lambda_combine ini setting. Only applies to destructured fixtures with params.
+
+    :param lazy:
+        If True, each param (or each value of a destructured pytest.param) must be a
+        factory taking no arguments, which is called to build the param's value when a
+        test sets it up. Tests are parametrized only by the index of each param, so
+        large param values aren't held by every collected test for the whole session;
+        they're released once the fixture's scope is torn down. As the values aren't
+        available at collection, pass ids to name the params (a callable ids receives
+        each factory).
+
     """
     fixture_names_or_lambda: Tuple[str | Callable, ...] | str | Callable | None
 
@@ -67,10 +105,31 @@ def lambda_fixture(
     else:
         fixture_names_or_lambda = fixture_name_or_lambda
 
+    if lazy:
+        if params is None:
+            raise ValueError('lazy=True requires params')
+        if fixture_names_or_lambda is not None or bind or async_ or background_loop:
+            raise ValueError(
+                'lazy=True cannot be combined with a fixture name/lambda, bind, async_, '
+                'or background_loop. The param factories build the fixture\'s value.')
+
+        return LazyLambdaFixture(
+            params,
+            ids=ids,
+            budget_ms=budget_ms,
+            budget_bytes=budget_bytes,
+            combine=combine,
+            scope=scope, autouse=autouse, name=name,
+        )
+
     return LambdaFixture(
         fixture_names_or_lambda,
         bind=bind,
         async_=async_,
+        background_loop=background_loop,
+        budget_ms=budget_ms,
+        budget_bytes=budget_bytes,
+        combine=combine,
         scope=scope, params=params, autouse=autouse, ids=ids, name=name,
     )
 
@@ -140,11 +199,11 @@ def disabled_fixture(**fixture_kwargs) -> LambdaFixture[NoReturn]:
 
     """
     def build_disabled_fixture_error(request):
-        msg = (f'Usage of the {request.fixturename} fixture has been disabled '
-               f'in the current context.')
-        return DisabledFixtureError(msg)
+        return _build_disabled_fixture_error(request.fixturename)
 
-    return error_fixture(build_disabled_fixture_error, **fixture_kwargs)
+    fixture = error_fixture(build_disabled_fixture_error, **fixture_kwargs)
+    fixture.static_error = _build_disabled_fixture_error
+    return fixture
 
 
 def not_implemented_fixture(**fixture_kwargs) -> LambdaFixture[NoReturn]:
@@ -163,8 +222,134 @@ def not_implemented_fixture(**fixture_kwargs) -> LambdaFixture[NoReturn]:
 
     """
     def build_not_implemented_fixture_error(request):
-        msg = (f'Please define/override the {request.fixturename} fixture in '
-               f'the current context.')
-        return NotImplementedFixtureError(msg)
+        return _build_not_implemented_fixture_error(request.fixturename)
+
+    fixture = error_fixture(build_not_implemented_fixture_error, **fixture_kwargs)
+    fixture.static_error = _build_not_implemented_fixture_error
+    return fixture
+
+
+# NOTE: the errors of disabled/not-implemented fixtures are known ahead of time, so
+#       pytest_lambda.failfast raises them before any of a test's fixtures are set up.
+
+def _build_disabled_fixture_error(fixturename: str) -> DisabledFixtureError:
+    msg = (f'Usage of the {fixturename} fixture has been disabled '
+           f'in the current context.')
+    return DisabledFixtureError(msg)
+
+
+def _build_not_implemented_fixture_error(fixturename: str) -> NotImplementedFixtureError:
+    msg = (f'Please define/override the {fixturename} fixture in '
+           f'the current context.')
+    return NotImplementedFixtureError(msg)
+
+
+def batch_fixture(
+    builder: Callable[..., Any],
+    params: Iterable[object],
+    *,
+    ids: Iterable[None | str | float | int | bool] | Callable[[Any], object | None] | None = None,
+    scope: _Scope = 'module',
+    autouse: bool = False,
+    name: str | None = None,
+) -> BatchLambdaFixture:
+    """Parametrized fixture whose params are built all at once, at a higher scope
+
+    Where lambda_fixture(params=...) sets up each param separately, batch_fixture
+    calls builder once per scope with the values of all params (e.g. to perform a
+    single bulk insert), and each test receives the result for its own param.
+
+    Usage:
+
+        users = batch_fixture(
+            lambda names, db: db.bulk_create([User(name=name) for name in names]),
+            params=['alice', 'bob'],
+        )
+
+        def test_user(users):
+            assert users.name in ('alice', 'bob')
+
+        # Destructuring is supported, too – each result must be a sequence
+        user, profile = batch_fixture(
+            lambda pairs: [(User(name), Profile(bio)) for name, bio in pairs],
+            params=[pytest.param('alice', 'bio-a'), pytest.param('bob', 'bio-b')],
+        )
+
+    :param builder:
+        Function receiving the list of all param values as its first argument, and
+        returning a sequence of results, one for each param (in the same order). Its
+        other parameters are requested as fixtures.
+
+    :param params:
+    :param ids:
+        The params to parametrize tests by, and their ids, as with lambda_fixture
+
+    :param scope:
+        The scope at which builder is called (the results are cached at this scope).
+        Each test receives its param's result as a function-scoped fixture.
+
+    :param autouse:
+    :param name:
+        Options to pass to pytest.fixture()
 
-    return error_fixture(build_not_implemented_fixture_error, **fixture_kwargs)
+    """
+    return BatchLambdaFixture(builder, params, ids=ids, scope=scope, autouse=autouse, name=name)
+
+
+def fork_fixture(
+    fixture_name_or_lambda: str | Callable[..., VT],
+    *other_fixture_names: str,
+    scope: _Scope = 'session',
+    params: Iterable[object] | None = None,
+    autouse: bool = False,
+    ids: Iterable[None | str | float | int | bool] | Callable[[Any], object | None] | None = None,
+    name: str | None = None,
+    max_workers: int | None = None,
+) -> ForkLambdaFixture[VT]:
+    """Fixture built once, whose dependent tests each run in a forked child process
+
+    The fixture is set up once (per scope) in the main pytest process, and every
+    test requesting it (directly or through other fixtures) is run in a process
+    forked from it. Thanks to copy-on-write, each test receives its own isolated
+    copy of the value, without the cost of rebuilding it — so tests may freely
+    mutate huge structures. Reports are sent back to the main process over a pipe.
+
+    Forking requires os.fork() (i.e. not Windows); where it's unavailable, tests
+    are run in-process, as with a plain lambda_fixture.
+
+    Usage:
+
+        graph = fork_fixture(lambda: load_huge_graph())
+
+        def test_delete_node(graph):
+            graph.remove_node('a')  # other tests still see node 'a'
+
+    :param fixture_name_or_lambda:
+    :param other_fixture_names:
+        The lambda (or fixture names to alias) building the value, as with lambda_fixture
+
+    :param scope:
+    :param params:
+    :param autouse:
+    :param ids:
+    :param name:
+        Options to pass to pytest.fixture(). The scope must not be "function".
+
+    :param max_workers:
+        Maximum number of forked children running at once. Consecutive tests sharing
+        the same higher-scoped fixtures are run concurrently, up to this limit.
+        Defaults to the lambda_fork_workers ini setting (1, by default).
+
+    """
+    if scope == 'function':
+        raise ValueError('fork_fixture must be set up in a higher scope than "function"')
+
+    fixture_names_or_lambda = (
+        (fixture_name_or_lambda,) + other_fixture_names
+        if other_fixture_names
+        else fixture_name_or_lambda
+    )
+    return ForkLambdaFixture(
+        fixture_names_or_lambda, max_workers=max_workers,
+        scope=scope, params=params, autouse=autouse, ids=ids, name=name,
+    )
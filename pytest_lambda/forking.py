@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import traceback
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pytest
+from _pytest.runner import runtestprotocol
+
+from pytest_lambda.impl import ForkLambdaFixture
+
+__all__ = ['LambdaForkRunner']
+
+
+class _ForkedChild(NamedTuple):
+    item: pytest.Item
+    pid: int
+    read_fd: int
+
+
+class LambdaForkRunner:
+    """Run each test using a fork_fixture in a child process forked from pytest
+
+    Before forking, the collectors of the test and all its higher-scoped fixtures
+    are set up in the main process, so their values are inherited by the child
+    (copy-on-write). The child then runs the usual setup/call/teardown protocol —
+    tearing down only what it set up itself — and sends back its reports, which
+    the main process logs as if the test had been run in-process.
+
+    Consecutive tests sharing the same collectors and higher-scoped params run
+    concurrently, up to the max_workers of their fork fixtures (their reports are
+    logged once they finish). Before anything in the main process is torn down or
+    rebuilt, all children are waited upon. On xdist workers, which expect reports
+    by the end of each test's protocol, children are run one at a time.
+    """
+
+    def __init__(self, config: pytest.Config, max_workers: int = 1):
+        self.config = config
+        self.max_workers = max_workers
+        self.pending: List[_ForkedChild] = []
+        self.pending_key: Optional[Tuple] = None
+        self._uses_fork: Dict[pytest.Item, Optional[int]] = {}
+
+    def get_max_workers(self, item: pytest.Item) -> Optional[int]:
+        """Return the worker limit of item's fork fixtures, or None if it uses none"""
+        if item not in self._uses_fork:
+            # Tests failing fast (see pytest_lambda.failfast) mustn't set anything up
+            failfast = self.config.pluginmanager.get_plugin('lambda-failfast')
+            if failfast is not None and failfast.has_error(item):
+                self._uses_fork[item] = None
+                return None
+
+            limits = [
+                fixturedef.func.max_workers or self.max_workers
+                for fixturedef in _iter_fork_fixturedefs(item)
+            ]
+            max_workers = max(min(limits), 1) if limits else None
+
+            # xdist expects each test's reports by the end of its runtest protocol
+            if max_workers is not None and hasattr(self.config, 'workerinput'):
+                max_workers = 1
+
+            self._uses_fork[item] = max_workers
+        return self._uses_fork[item]
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item: pytest.Item, nextitem: Optional[pytest.Item]):
+        max_workers = self.get_max_workers(item)
+        if max_workers is None or not hasattr(os, 'fork'):
+            self.wait_all()
+            return None
+
+        key = _get_shared_state_key(item)
+        if self.pending and key != self.pending_key:
+            self.wait_all()
+
+        try:
+            self._setup_shared_state(item)
+        except (Exception, pytest.fail.Exception, pytest.skip.Exception):
+            # Let the usual protocol run, so the (cached) error is reported as usual.
+            # NOTE: on pytest<8, a request which failed to set up a fixture would
+            #       report a recursive dependency upon requesting it again.
+            item._initrequest()  # type: ignore[attr-defined]
+            self.wait_all()
+            return None
+
+        while len(self.pending) >= max_workers:
+            self.wait_next()
+
+        self.pending.append(self._fork(item))
+        self.pending_key = key
+
+        if max_workers == 1 or nextitem is None or self.get_max_workers(nextitem) is None \
+                or _get_shared_state_key(nextitem) != key:
+            self.wait_all()
+
+        _cleanup_request(item)
+        self._teardown_shared_state(item, nextitem)
+        return True
+
+    def pytest_sessionfinish(self, session) -> None:
+        self.wait_all()
+
+    def _setup_shared_state(self, item: pytest.Item) -> None:
+        item.session._setupstate.setup(item.parent)  # type: ignore[attr-defined,arg-type]
+
+        name2fixturedefs = item._fixtureinfo.name2fixturedefs  # type: ignore[attr-defined]
+        for argname in item.fixturenames:  # type: ignore[attr-defined]
+            fixturedefs = name2fixturedefs.get(argname)
+            if fixturedefs and fixturedefs[-1].scope != 'function':
+                item._request.getfixturevalue(argname)  # type: ignore[attr-defined]
+
+    def _teardown_shared_state(self, item: pytest.Item, nextitem: Optional[pytest.Item]) -> None:
+        call = pytest.CallInfo.from_call(
+            lambda: item.session._setupstate.teardown_exact(nextitem),  # type: ignore[attr-defined]
+            when='teardown',
+        )
+        if call.excinfo is not None:
+            report = item.ihook.pytest_runtest_makereport(item=item, call=call)
+            item.ihook.pytest_runtest_logreport(report=report)
+
+    def _fork(self, item: pytest.Item) -> _ForkedChild:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover (child)
+            os.close(read_fd)
+            _run_child(item, write_fd)
+
+        os.close(write_fd)
+        return _ForkedChild(item, pid, read_fd)
+
+    def wait_next(self) -> None:
+        """Wait for the oldest child to finish, and log its reports"""
+        child = self.pending.pop(0)
+        with os.fdopen(child.read_fd, 'r') as pipe:
+            data = pipe.read()
+        _, status = os.waitpid(child.pid, 0)
+
+        item = child.item
+        if data:
+            reports = [
+                self.config.hook.pytest_report_from_serializable(config=self.config, data=report)
+                for report in json.loads(data)
+            ]
+        else:
+            reports = [_make_crash_report(item, status)]
+
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        for report in reports:
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+
+    def wait_all(self) -> None:
+        while self.pending:
+            self.wait_next()
+
+
+def _run_child(item: pytest.Item, write_fd: int) -> None:  # pragma: no cover (child)
+    exit_code = 0
+    try:
+        # Capture into files of our own, rather than those shared with our siblings
+        capman = item.config.pluginmanager.getplugin('capturemanager')
+        if capman is not None and capman.is_globally_capturing():
+            capman.stop_global_capturing()
+            capman.start_global_capturing()
+
+        # NOTE: the parent collector is passed as nextitem, so only the test itself
+        #       (and its function-scoped fixtures) is torn down in the child
+        reports = runtestprotocol(item, log=False, nextitem=item.parent)  # type: ignore[arg-type]
+        data = [
+            item.config.hook.pytest_report_to_serializable(config=item.config, report=report)
+            for report in reports
+        ]
+        with os.fdopen(write_fd, 'w') as pipe:
+            json.dump(data, pipe)
+    except BaseException:
+        traceback.print_exc(file=sys.__stderr__)
+        exit_code = 1
+    finally:
+        os._exit(exit_code)
+
+
+def _make_crash_report(item: pytest.Item, status: int) -> pytest.TestReport:
+    if os.WIFSIGNALED(status):
+        reason = f'signal {os.WTERMSIG(status)}'
+    else:
+        reason = f'exit code {os.WEXITSTATUS(status)}'
+
+    return pytest.TestReport(
+        item.nodeid,
+        item.location,
+        {keyword: 1 for keyword in item.keywords},
+        'failed',
+        f'Forked test process crashed with {reason}',
+        'call',
+    )
+
+
+def _cleanup_request(item: pytest.Item) -> None:
+    # Mirrors the cleanup of pytest's runtestprotocol, releasing fixture values
+    if getattr(item, '_request', None):
+        item._request = False  # type: ignore[attr-defined]
+        item.funcargs = None  # type: ignore[attr-defined]
+
+
+def _iter_fork_fixturedefs(item: pytest.Item):
+    name2fixturedefs = getattr(getattr(item, '_fixtureinfo', None), 'name2fixturedefs', {})
+    for argname in getattr(item, 'fixturenames', ()):
+        fixturedefs = name2fixturedefs.get(argname)
+        if fixturedefs and isinstance(fixturedefs[-1].func, ForkLambdaFixture):
+            yield fixturedefs[-1]
+
+
+def _get_shared_state_key(item: pytest.Item) -> Tuple:
+    """Identify the collectors and higher-scoped params item's setup relies upon
+
+    Consecutive tests with the same key are run without tearing down or rebuilding
+    anything in the main process.
+    """
+    callspec = getattr(item, 'callspec', None)
+    higher_scoped_indices: Tuple = ()
+    if callspec is not None:
+        arg2scope = getattr(callspec, '_arg2scope', {})
+        higher_scoped_indices = tuple(sorted(
+            (argname, index)
+            for argname, index in callspec.indices.items()
+            if getattr(arg2scope.get(argname), 'value', 'function') != 'function'
+        ))
+    return item.parent.nodeid if item.parent else '', higher_scoped_indices
+
@@ -2,20 +2,28 @@ from __future__ import annotations
 
 import functools
 import inspect
+import threading
 from types import ModuleType
-from typing import Any, Generic, List, Optional, Tuple, TypeVar, Union, cast
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union, cast,
+)
 
 import pytest
 import wrapt  # type: ignore[import]
 from _pytest.mark import ParameterSet
 
+from .background import background_proxy, run_in_background_loop
 from .compat import _PytestWrapper
+from .spans import span
 from .types import LambdaFixtureKwargs
 
+if TYPE_CHECKING:
+    from .types import _Scope
+
 try:
     from collections.abc import Iterable, Sized
 except ImportError:
-    from collections import Iterable, Sized
+    from collections import Iterable, Sized  # type: ignore[attr-defined,no-redef]
 
 _IDENTITY_LAMBDA_FORMAT = '''
 {name} = lambda {argnames}: ({argnames})
@@ -25,6 +33,22 @@ _DESTRUCTURED_PARAMETRIZED_LAMBDA_FORMAT = '''
 {name} = lambda {source_name}: {source_name}[{index}]
 '''
 
+_BATCH_LAMBDA_FORMAT = '''
+{name} = lambda {argnames}: check(builder(values, {kwargs}))
+'''
+
+_BATCH_ITEM_LAMBDA_FORMAT = '''
+{name} = lambda {batch_name}, {index_name}: {batch_name}[{index_name}]{subscript}
+'''
+
+_LAZY_PARAM_LAMBDA_FORMAT = '''
+{name} = lambda {index_name}: build_param({index_name})
+'''
+
+#: Guards the contribution (and destructuring) of lambda fixtures, which may touch
+#: several fixtures at once (e.g. all those destructured from a batch fixture)
+_contribution_lock = threading.RLock()
+
 
 def create_identity_lambda(name, *argnames):
     source = _IDENTITY_LAMBDA_FORMAT.format(name=name, argnames=', '.join(argnames))
@@ -46,6 +70,46 @@ def create_destructured_parametrized_lambda(name: str, source_name: str, index:
     return fixture_func
 
 
+def create_batch_lambda(name: str, builder: Callable, values: list, check: Callable):
+    """Create a fixture func calling builder with all param values, and its requested fixtures
+
+    The first parameter of builder receives the values; all others are requested as fixtures.
+    The builder's results are passed through check before being returned.
+    """
+    argnames = tuple(inspect.signature(builder).parameters)[1:]
+    source = _BATCH_LAMBDA_FORMAT.format(
+        name=name,
+        argnames=', '.join(argnames),
+        kwargs=', '.join(f'{arg}={arg}' for arg in argnames),
+    )
+    context: dict[str, Any] = {'builder': builder, 'values': values, 'check': check}
+    exec(source, context)
+
+    fixture_func = context[name]
+    return fixture_func
+
+
+def create_batch_item_lambda(name: str, batch_name: str, index_name: str, child_index: int | None = None):
+    subscript = f'[{child_index}]' if child_index is not None else ''
+    source = _BATCH_ITEM_LAMBDA_FORMAT.format(
+        name=name, batch_name=batch_name, index_name=index_name, subscript=subscript,
+    )
+    context: dict[str, Any] = {}
+    exec(source, context)
+
+    fixture_func = context[name]
+    return fixture_func
+
+
+def create_lazy_param_lambda(name: str, index_name: str, build_param: Callable[[int], Any]):
+    source = _LAZY_PARAM_LAMBDA_FORMAT.format(name=name, index_name=index_name)
+    context: dict[str, Any] = {'build_param': build_param}
+    exec(source, context)
+
+    fixture_func = context[name]
+    return fixture_func
+
+
 VT = TypeVar('VT')
 
 
@@ -57,21 +121,35 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
     _self_iter: Iterable | None
     _self_params_source: LambdaFixture | None
 
+    # Until finalized (see finalize()), the fixture's state may be changed
+    _self_finalized = False
+
     def __init__(
         self,
         fixture_names_or_lambda,
         *,
         bind: bool = False,
         async_: bool = False,
+        background_loop: bool = False,
+        budget_ms: Optional[float] = None,
+        budget_bytes: Optional[int] = None,
+        combine: Union[str, int, None] = None,
         _params_source: Optional['LambdaFixture'] = None,
         **fixture_kwargs,
     ):
         self.bind = bind
-        self.is_async = async_
+        self.is_async = async_ or background_loop
+        self.background_loop = background_loop
+        self.budget_ms = budget_ms
+        self.budget_bytes = budget_bytes
+        self.combine = combine
+        self.static_error = None
         self.fixture_kwargs = cast(LambdaFixtureKwargs, fixture_kwargs)
         self.fixture_func = self._not_implemented
         self.has_fixture_func = False
+        self.finalized = False
         self.parent = None
+        self.hidden_fixtures = {}
         self._self_iter = None
         self._self_params_source = _params_source
 
@@ -106,6 +184,14 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
             params = fixture_kwargs['params'] = tuple(fixture_kwargs['params'])
             self._self_iter = _LambdaFixtureParametrizedIterator(self, params)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # NOTE: the properties exposing the fixture's state all store _self_ attrs
+        if name.startswith('_self_') and self._self_finalized:
+            raise RuntimeError(
+                f'The {self.__name__} lambda fixture has been finalized, and its '
+                f'{name[len("_self_"):]} may no longer be changed.')
+        super().__setattr__(name, value)
+
     def __call__(self, *args, **kwargs) -> VT:
         if self.bind:
             args = (self.parent,) + args
@@ -121,6 +207,11 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
             'This is a catastrophic error!')
 
     def set_fixture_func(self, fixture_names_or_lambda):
+        if self.finalized:
+            raise RuntimeError(
+                f'The {self.__name__} lambda fixture has been finalized, and its '
+                f'fixture_func may no longer be changed.')
+
         self.fixture_func = self.build_fixture_func(fixture_names_or_lambda)
         self.has_fixture_func = True
 
@@ -142,9 +233,21 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
                 async def insulator(*args, **kwargs):
                     val = real_fixture_func(*args, **kwargs)
                     if inspect.isawaitable(val):
-                        val = await val
+                        with span(self.__name__, 'await', scope=self.fixture_kwargs.get('scope', 'function')):
+                            val = await val
                     return val
 
+                if self.background_loop:
+                    # The fixture is exposed to pytest as a sync function, which
+                    # blocks until insulator completes on the long-lived background
+                    # loop, and proxies its value for use from other threads/loops.
+                    async_insulator = insulator
+
+                    @functools.wraps(real_fixture_func)
+                    def insulator(*args, **kwargs):
+                        value = run_in_background_loop(async_insulator(*args, **kwargs))
+                        return background_proxy(value)
+
             else:
                 @functools.wraps(real_fixture_func)
                 def insulator(*args, **kwargs):
@@ -175,7 +278,20 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
         This method is called during collection, when a LambdaFixture is
         encountered in a module or class. This method is responsible for saving
         any names and setting any attributes on parent as necessary.
+
+        Only the first parent is contributed to; the fixture is encountered again in
+        each subclass inheriting it (or module importing it), but its name, module, and
+        parent are kept — only the hidden fixtures it relies upon are attached to those
+        other parents. Once finalized, the fixture's state is never changed, so it may
+        be invoked from multiple threads.
         """
+        with _contribution_lock:
+            if self.parent is None:
+                self._contribute_to_parent(parent, name)
+            elif self.parent is not parent:
+                self.contribute_hidden_fixtures(parent)
+
+    def _contribute_to_parent(self, parent: Union[type, ModuleType], name: str):
         is_in_class = isinstance(parent, type)
         is_in_module = isinstance(parent, ModuleType)
         assert is_in_class or is_in_module
@@ -185,7 +301,7 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
             raise ValueError(f'bind=True cannot be used at the module level. '
                              f'Please remove this arg in the {name} fixture in {source_location}')
 
-        if self._self_params_source:
+        if self._self_params_source is not None:
             self.set_fixture_func(self._not_implemented)
 
         elif not self.has_fixture_func:
@@ -200,6 +316,34 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
             parent.__module__ if is_in_class else parent.__name__)
         self.parent = parent
 
+        if self._self_params_source is not None:
+            self._self_params_source.contribute_destructured_child(self, parent)
+        else:
+            self.finalize()
+
+    def contribute_destructured_child(self, child: LambdaFixture, parent: Union[type, ModuleType]):
+        """Called after a fixture destructured from this one has been contributed to parent
+
+        The param source is responsible for finalizing its destructured children.
+        """
+        child.finalize()
+
+    def contribute_hidden_fixtures(self, parent: Union[type, ModuleType]):
+        """Attach the hidden fixtures this fixture (or its param source) relies upon to parent"""
+        source = self._self_params_source or self
+        for name, fixture in source.hidden_fixtures.items():
+            if getattr(parent, name, None) is not fixture:
+                setattr(parent, name, fixture)
+
+    def finalize(self) -> None:
+        """Freeze the fixture's state, once it has been contributed to its parent
+
+        Afterward, setting any of the fixture's attributes (e.g. fixture_kwargs, parent,
+        or bind) raises a RuntimeError.
+        """
+        if not self.finalized:
+            self.finalized = True
+
     # With --doctest-modules enabled, the doctest finder will enumerate all objects
     # in all relevant modules, and use `isinstance(obj, ...)` to determine whether
     # the object has doctests to collect. Under the hood, isinstance retrieves the
@@ -244,6 +388,31 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
     @is_async.setter
     def is_async(self, value: bool) -> None: self._self_is_async = value
 
+    @property
+    def background_loop(self) -> bool: return self._self_background_loop
+    @background_loop.setter
+    def background_loop(self, value: bool) -> None: self._self_background_loop = value
+
+    @property
+    def budget_ms(self) -> float | None: return self._self_budget_ms
+    @budget_ms.setter
+    def budget_ms(self, value: float | None) -> None: self._self_budget_ms = value
+
+    @property
+    def budget_bytes(self) -> int | None: return self._self_budget_bytes
+    @budget_bytes.setter
+    def budget_bytes(self, value: int | None) -> None: self._self_budget_bytes = value
+
+    @property
+    def combine(self) -> str | int | None: return self._self_combine
+    @combine.setter
+    def combine(self, value: str | int | None) -> None: self._self_combine = value
+
+    @property
+    def static_error(self) -> Callable[[str], Exception] | None: return self._self_static_error
+    @static_error.setter
+    def static_error(self, value: Callable[[str], Exception] | None) -> None: self._self_static_error = value
+
     @property
     def fixture_kwargs(self) -> LambdaFixtureKwargs: return self._self_fixture_kwargs
     @fixture_kwargs.setter
@@ -259,10 +428,20 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
     @has_fixture_func.setter
     def has_fixture_func(self, value: bool) -> None: self._self_has_fixture_func = value
 
+    @property
+    def finalized(self) -> bool: return self._self_finalized
+    @finalized.setter
+    def finalized(self, value: bool) -> None: self._self_finalized = value
+
     @property
     def parent(self) -> type | ModuleType | None: return self._self_parent
     @parent.setter
-    def parent(self, value: type | ModuleType): self._self_parent = value
+    def parent(self, value: type | ModuleType | None) -> None: self._self_parent = value
+
+    @property
+    def hidden_fixtures(self) -> Dict[str, LambdaFixture]: return self._self_hidden_fixtures
+    @hidden_fixtures.setter
+    def hidden_fixtures(self, value: Dict[str, LambdaFixture]) -> None: self._self_hidden_fixtures = value
 
     @property
     def _pytestfixturefunction(self) -> bool: return self._self__pytestfixturefunction
@@ -275,6 +454,372 @@ class LambdaFixture(Generic[VT], wrapt.ObjectProxy):
     def __pytest_wrapped__(self, value: _PytestWrapper) -> None: self._self___pytest_wrapped__ = value
 
 
+class BatchLambdaFixture(LambdaFixture[VT]):
+    """A parametrized lambda fixture whose params are all built at once, at a higher scope
+
+    The builder is called once per batch scope with the values of all params, and
+    must return a sequence with a result for each param (in the same order). Each
+    test receives the result at the index of its param. When destructured, each
+    result must be a sequence with an item for each destructured fixture.
+
+    Tests are parametrized (by pytest_generate_tests) over a hidden index argname,
+    and the builder's results are exposed through a hidden fixture of the batch
+    scope, both named after the batch fixture (or its destructured fixtures).
+    """
+
+    def __init__(
+        self,
+        builder: Callable,
+        params: Iterable,
+        *,
+        ids: Iterable | Callable[[Any], object | None] | None = None,
+        scope: str = 'module',
+        **fixture_kwargs,
+    ):
+        self._self_batch_builder = builder
+        super().__init__(builder, **fixture_kwargs)
+
+        self.batch_params = tuple(params)
+        if not self.batch_params:
+            raise ValueError('batch_fixture requires at least one param')
+
+        self.batch_ids = ids
+        self.batch_scope = scope
+        self.base_name = None
+        self.index_name = None
+        self._self_iter = _LambdaFixtureParametrizedIterator(self, self.batch_params)
+
+    def __iter__(self):
+        return iter(self._params_iter)
+
+    @property
+    def _params_iter(self) -> _LambdaFixtureParametrizedIterator:
+        return cast(_LambdaFixtureParametrizedIterator, self._self_iter)
+
+    @property
+    def values(self) -> list:
+        """The values of each param, as passed to the builder"""
+        num_children = self._params_iter.num_params
+        values = []
+        for param in self.batch_params:
+            value = param.values if isinstance(param, ParameterSet) else param
+            if num_children == 1 and isinstance(param, ParameterSet):
+                value = value[0]
+            values.append(value)
+        return values
+
+    def get_index_params(self) -> List[ParameterSet]:
+        """Return the params to parametrize tests by, over each param index"""
+        argnames = self._params_iter.child_names
+        if not argnames:
+            assert self.base_name is not None, 'batch fixture has not been contributed'
+            argnames = (self.base_name,)
+        return build_index_params(self.batch_params, self.batch_ids, argnames)
+
+    @property
+    def index_scope(self) -> _Scope | None:
+        """Scope to parametrize tests by the param index at"""
+        return None
+
+    def _contribute_to_parent(self, parent: Union[type, ModuleType], name: str):
+        index_name = self._contribute_batch(parent, name)
+        self.set_fixture_func(create_batch_item_lambda(name, f'{name}__batch', index_name))
+        super()._contribute_to_parent(parent, name)
+
+    def contribute_destructured_child(self, child: LambdaFixture, parent: Union[type, ModuleType]):
+        children = self._params_iter.destructured
+        if not all(sibling.parent is parent for sibling in children):
+            return  # wait until all destructured fixtures have been named
+
+        child_names = self._params_iter.child_names
+        base_name = '__'.join(child_names)
+        index_name = self._contribute_batch(parent, base_name)
+
+        for index, (sibling, sibling_name) in enumerate(zip(children, child_names)):
+            sibling.set_fixture_func(create_batch_item_lambda(
+                sibling_name, f'{base_name}__batch', index_name, index))
+            sibling.__name__ = sibling.fixture_func.__name__ = sibling_name
+            sibling.__module__ = sibling.fixture_func.__module__ = child.__module__
+            sibling.finalize()
+
+    def _contribute_batch(self, parent: Union[type, ModuleType], base_name: str) -> str:
+        """Attach the hidden fixture building the batch, returning the index argname"""
+        builder = self._self_batch_builder
+        values = self.values
+        batch_name = f'{base_name}__batch'
+        index_name = f'{base_name}__batch_index'
+        self.base_name = base_name
+        self.index_name = index_name
+
+        def check_results(results):
+            if len(results) != len(values):
+                raise ValueError(
+                    f'The builder of batch fixture {base_name} returned {len(results)} '
+                    f'results for {len(values)} params')
+            return results
+
+        batch_fixture: LambdaFixture[list] = LambdaFixture(
+            create_batch_lambda(batch_name, builder, values, check_results),
+            scope=self.batch_scope,
+        )
+        self.hidden_fixtures[batch_name] = batch_fixture
+        setattr(parent, batch_name, batch_fixture)
+        batch_fixture.contribute_to_parent(parent, batch_name)
+        return index_name
+
+    @property
+    def batch_params(self) -> Tuple: return self._self_batch_params
+    @batch_params.setter
+    def batch_params(self, value: Tuple) -> None: self._self_batch_params = value
+
+    @property
+    def batch_ids(self): return self._self_batch_ids
+    @batch_ids.setter
+    def batch_ids(self, value) -> None: self._self_batch_ids = value
+
+    @property
+    def batch_scope(self) -> str: return self._self_batch_scope
+    @batch_scope.setter
+    def batch_scope(self, value: str) -> None: self._self_batch_scope = value
+
+    @property
+    def base_name(self) -> str | None: return self._self_base_name
+    @base_name.setter
+    def base_name(self, value: str | None) -> None: self._self_base_name = value
+
+    @property
+    def index_name(self) -> str | None: return self._self_index_name
+    @index_name.setter
+    def index_name(self, value: str | None) -> None: self._self_index_name = value
+
+
+class LazyLambdaFixture(LambdaFixture[VT]):
+    """A parametrized lambda fixture whose param values are built by factories at setup
+
+    Each param (or each value of a pytest.param, when destructured) is a factory
+    taking no arguments. Tests are parametrized (by pytest_generate_tests) only over
+    a hidden index argname, named after the fixture (or its destructured fixtures),
+    so the CallSpecs of collected tests hold ints, rather than the param values.
+
+    When a test sets up a param, its factories are called by a hidden fixture of the
+    lazy fixture's scope, which caches the values until it's torn down.
+    """
+
+    def __init__(
+        self,
+        params: Iterable,
+        *,
+        ids: Iterable | Callable[[Any], object | None] | None = None,
+        scope: str = 'function',
+        **fixture_kwargs,
+    ):
+        super().__init__(None, scope=scope, **fixture_kwargs)
+        # The real fixture_func is only known once contributed (it's named after the fixture)
+        self.set_fixture_func(self._not_implemented)
+
+        self.lazy_params = tuple(params)
+        if not self.lazy_params:
+            raise ValueError('lazy=True requires at least one param')
+
+        self.lazy_ids = ids
+        self.base_name = None
+        self.index_name = None
+        self._self_iter = _LambdaFixtureParametrizedIterator(self, self.lazy_params)
+
+    def __iter__(self):
+        return iter(self._params_iter)
+
+    @property
+    def _params_iter(self) -> _LambdaFixtureParametrizedIterator:
+        return cast(_LambdaFixtureParametrizedIterator, self._self_iter)
+
+    def build_param(self, index: int) -> Any:
+        """Call the factories of the param at index, returning its value(s)"""
+        param = self.lazy_params[index]
+        factories: Any = param.values if isinstance(param, ParameterSet) else param
+
+        if not self._params_iter.destructured:
+            if isinstance(param, ParameterSet):
+                factories = factories[0]
+            return factories()
+
+        if not isinstance(factories, (tuple, list)):
+            factories = (factories,)
+        return tuple(factory() for factory in factories)
+
+    def get_index_params(self) -> List[ParameterSet]:
+        """Return the params to parametrize tests by, over each param index"""
+        argnames = self._params_iter.child_names
+        if not argnames:
+            assert self.base_name is not None, 'lazy fixture has not been contributed'
+            argnames = (self.base_name,)
+        return build_index_params(self.lazy_params, self.lazy_ids, argnames)
+
+    @property
+    def index_scope(self) -> _Scope | None:
+        """Scope to parametrize tests by the param index at"""
+        return self.fixture_kwargs.get('scope')
+
+    def _contribute_to_parent(self, parent: Union[type, ModuleType], name: str):
+        index_name = f'{name}__lazy_index'
+        self.base_name = name
+        self.index_name = index_name
+        self.set_fixture_func(create_lazy_param_lambda(name, index_name, self.build_param))
+        super()._contribute_to_parent(parent, name)
+
+    def contribute_destructured_child(self, child: LambdaFixture, parent: Union[type, ModuleType]):
+        children = self._params_iter.destructured
+        if not all(sibling.parent is parent for sibling in children):
+            return  # wait until all destructured fixtures have been named
+
+        base_name = '__'.join(self._params_iter.child_names)
+        param_name = f'{base_name}__lazy_param'
+        index_name = f'{base_name}__lazy_index'
+        self.base_name = base_name
+        self.index_name = index_name
+
+        param_fixture: LambdaFixture[tuple] = LambdaFixture(
+            create_lazy_param_lambda(param_name, index_name, self.build_param),
+            scope=self.index_scope or 'function',
+        )
+        self.hidden_fixtures[param_name] = param_fixture
+        setattr(parent, param_name, param_fixture)
+        param_fixture.contribute_to_parent(parent, param_name)
+
+        for index, sibling in enumerate(children):
+            # Like the values of eagerly-parametrized destructured fixtures, each
+            # child is available at the scope of the params
+            sibling.fixture_kwargs = cast(LambdaFixtureKwargs, {
+                **sibling.fixture_kwargs, 'scope': self.index_scope or 'function'})
+            sibling._pytestfixturefunction = pytest.fixture(**sibling.fixture_kwargs)
+
+            sibling_name = sibling.__name__
+            sibling.set_fixture_func(
+                create_destructured_parametrized_lambda(sibling_name, param_name, index))
+            sibling.__name__ = sibling.fixture_func.__name__ = sibling_name
+            sibling.__module__ = sibling.fixture_func.__module__ = child.__module__
+            sibling.finalize()
+
+    @property
+    def lazy_params(self) -> Tuple: return self._self_lazy_params
+    @lazy_params.setter
+    def lazy_params(self, value: Tuple) -> None: self._self_lazy_params = value
+
+    @property
+    def lazy_ids(self): return self._self_lazy_ids
+    @lazy_ids.setter
+    def lazy_ids(self, value) -> None: self._self_lazy_ids = value
+
+    @property
+    def base_name(self) -> str | None: return self._self_base_name
+    @base_name.setter
+    def base_name(self, value: str | None) -> None: self._self_base_name = value
+
+    @property
+    def index_name(self) -> str | None: return self._self_index_name
+    @index_name.setter
+    def index_name(self, value: str | None) -> None: self._self_index_name = value
+
+
+class ForkLambdaFixture(LambdaFixture[VT]):
+    """A higher-scoped lambda fixture whose dependent tests each run in a forked child
+
+    The fixture is set up in the main pytest process, and each test using it is run
+    (by pytest_lambda.forking.LambdaForkRunner) in a child process forked from it,
+    which inherits a copy-on-write copy of its value. Mutations made by a test are
+    thus never seen by other tests.
+    """
+
+    def __init__(self, fixture_names_or_lambda, *, max_workers: int | None = None, **fixture_kwargs):
+        super().__init__(fixture_names_or_lambda, **fixture_kwargs)
+        self.max_workers = max_workers
+
+    @property
+    def max_workers(self) -> int | None: return self._self_max_workers
+    @max_workers.setter
+    def max_workers(self, value: int | None) -> None: self._self_max_workers = value
+
+
+def build_param_sets(
+    params: Iterable,
+    ids: Iterable | Callable[[Any], object | None] | None,
+    argnames: Tuple[str, ...],
+) -> List[ParameterSet]:
+    """Normalize params to ParameterSets, each with a value per argname and an explicit id
+
+    Ids are determined as pytest would for metafunc.parametrize(argnames, params, ids=ids)
+    """
+    explicit_ids = None if ids is None or callable(ids) else tuple(ids)
+
+    param_sets = []
+    for index, param in enumerate(params):
+        if isinstance(param, ParameterSet):
+            values = tuple(param.values)
+            param_id, marks = param.id, tuple(param.marks)
+        else:
+            values = (param,) if len(argnames) == 1 else tuple(param)
+            param_id, marks = None, ()
+
+        if param_id is None and explicit_ids is not None:
+            param_id = explicit_ids[index]
+
+        if param_id is None:
+            value_ids = []
+            for argname, value in zip(argnames, values):
+                value_id = ids(value) if callable(ids) else None
+                if value_id is None:
+                    value_id = _get_default_id(value, argname, index)
+                value_ids.append(str(value_id))
+            param_id = '-'.join(value_ids)
+
+        param_sets.append(ParameterSet(values=values, marks=marks, id=str(param_id)))
+    return param_sets
+
+
+def build_index_params(
+    params: Iterable,
+    ids: Iterable | Callable[[Any], object | None] | None,
+    argnames: Tuple[str, ...],
+) -> List[ParameterSet]:
+    """Return params over the index of each param, with the ids and marks of params"""
+    param_sets = build_param_sets(params, ids, argnames)
+    return [
+        pytest.param(index, id=param_set.id, marks=param_set.marks)
+        for index, param_set in enumerate(param_sets)
+    ]
+
+
+def _get_default_id(value: Any, argname: str | None, index: int) -> str:
+    """Mimic the ids pytest generates for params"""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return str(value)
+    return f'{argname}{index}'
+
+
+def is_lambda_fixture_func(func: Any) -> bool:
+    """Whether func is a LambdaFixture, or a fixture extension built by wrap_fixture
+
+    Wrappers of these (e.g. those pytest-asyncio replaces async fixture funcs with)
+    are recognized, too.
+    """
+    if isinstance(func, LambdaFixture) or hasattr(func, '_wrapped_fixturefunc'):
+        return True
+
+    wrapped = getattr(func, '__wrapped__', None)
+    return isinstance(wrapped, LambdaFixture) or hasattr(wrapped, '_wrapped_fixturefunc')
+
+
+def get_fixture_key(fixturedef) -> str:
+    """Return a stable, human-readable identifier for a fixture definition
+
+    The key is composed of the fixture's baseid (the nodeid of the module/class
+    it was declared in) and its name, e.g. "tests/test_db.py::TestModels::db"
+    """
+    if fixturedef.baseid:
+        return f'{fixturedef.baseid}::{fixturedef.argname}'
+    return fixturedef.argname
+
+
 class _LambdaFixtureParametrizedIterator:
     def __init__(self, source: LambdaFixture, params: Iterable):
         self.source = source
@@ -284,13 +829,15 @@ class _LambdaFixtureParametrizedIterator:
         self.destructured: List[LambdaFixture] = []
 
     def __iter__(self):
-        if self.destructured:
-            raise RuntimeError('Lambda fixtures may only be destructured once.')
-
-        for i in range(self.num_params):
-            child = LambdaFixture(None, _params_source=self.source)
-            self.destructured.append(child)
-            yield child
+        with _contribution_lock:
+            if self.destructured:
+                raise RuntimeError('Lambda fixtures may only be destructured once.')
+
+            self.destructured = [
+                LambdaFixture(None, _params_source=self.source)
+                for _ in range(self.num_params)
+            ]
+        return iter(self.destructured)
 
     @property
     def child_names(self) -> Tuple[str, ...]:
@@ -1,21 +1,297 @@
 import inspect
-from typing import List, Sequence, Set, Tuple
+import os
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, cast
 
 import pytest
 from _pytest.mark import Mark, ParameterSet
 from _pytest.python import Metafunc, Module
 
-from pytest_lambda.impl import LambdaFixture, _LambdaFixtureParametrizedIterator
+from pytest_lambda.collection import record_param_source
+from pytest_lambda.combinatorics import covering_array, parse_combine_strength
+from pytest_lambda.compat import PYTEST_VERSION
+from pytest_lambda.impl import (
+    BatchLambdaFixture,
+    LambdaFixture,
+    LazyLambdaFixture,
+    _LambdaFixtureParametrizedIterator,
+    _contribution_lock,
+    build_param_sets,
+)
+
+if TYPE_CHECKING:
+    from pytest_lambda.types import _Scope
+
+# (param source, argnames, params, scope, ids) of a parametrization to make
+_Parametrization = Tuple[LambdaFixture, Tuple[str, ...], Sequence, Optional['_Scope'], Any]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('lambda', 'pytest-lambda')
+    group.addoption(
+        '--lambda-profile',
+        action='store',
+        dest='lambda_profile',
+        metavar='GLOB',
+        default=None,
+        help='Profile the setup of lambda fixtures (and wrap_fixture extensions) whose '
+             'names match GLOB (comma-separated for multiple) with cProfile, writing '
+             '.pstats and collapsed stack files per fixture.',
+    )
+    group.addoption(
+        '--lambda-profile-dir',
+        action='store',
+        dest='lambda_profile_dir',
+        metavar='DIR',
+        default='lambda-profiles',
+        help='Directory to write lambda fixture profiles to (default: lambda-profiles)',
+    )
+    group.addoption(
+        '--lambda-baseline',
+        action='store',
+        dest='lambda_baseline',
+        choices=('record', 'check'),
+        default=None,
+        help='"record" stores the median setup time/memory of each lambda fixture in '
+             'the pytest cache as a baseline; "check" fails the session if any lambda '
+             'fixture regressed beyond --lambda-regression-ratio times its baseline.',
+    )
+    group.addoption(
+        '--lambda-regression-ratio',
+        action='store',
+        dest='lambda_regression_ratio',
+        type=float,
+        metavar='RATIO',
+        default=None,
+        help='Ratio of current to baseline setup cost considered a regression by '
+             '--lambda-baseline=check (default: lambda_regression_ratio ini setting, or 5)',
+    )
+    group.addoption(
+        '--lambda-reorder',
+        action='store_true',
+        dest='lambda_reorder',
+        default=False,
+        help='Reorder tests to minimize re-setups of higher-scoped parametrized lambda '
+             'fixtures, prioritizing fixtures by their setup cost in previous runs.',
+    )
+    group.addoption(
+        '--lambda-affinity',
+        action='store_true',
+        dest='lambda_affinity',
+        default=False,
+        help='With pytest-xdist, send tests sharing the same instance of an expensive '
+             'higher-scoped lambda fixture to the same worker, based on setup costs '
+             'and fixture usage recorded in previous runs. Only applies to '
+             '--dist=load and --dist=loadscope.',
+    )
+    group.addoption(
+        '--lambda-affinity-min-ms',
+        action='store',
+        dest='lambda_affinity_min_ms',
+        type=float,
+        metavar='MS',
+        default=10.0,
+        help='Minimum setup time (in milliseconds) of a lambda fixture for --lambda-affinity '
+             'to group the tests sharing it (default: 10)',
+    )
+    group.addoption(
+        '--lambda-trace',
+        action='store',
+        dest='lambda_trace',
+        metavar='PATH',
+        default=None,
+        help='Write a timeline of lambda fixture setups, teardowns, and awaits to PATH, '
+             'in Chrome\'s trace event format (viewable with Perfetto or chrome://tracing).',
+    )
+    group.addoption(
+        '--lambda-changed',
+        action='store_true',
+        dest='lambda_changed',
+        default=False,
+        help='Deselect tests whose code, and the code of the fixtures they use, is '
+             'unchanged since they last passed (as recorded in the pytest cache). '
+             'Only functions and literal values reachable from their code are hashed; '
+             'changes to other objects (e.g. class attributes, data files) are not detected.',
+    )
+
+    parser.addini(
+        'lambda_combine',
+        'How tests using multiple destructured parametrized lambda fixtures combine '
+        'their params: "product" (default), "pairwise", or an n-wise strength',
+        default='product',
+    )
+    parser.addini(
+        'lambda_budget_ms',
+        'Default setup time budget (in milliseconds) of all lambda fixtures',
+        default=None,
+    )
+    parser.addini(
+        'lambda_budget_bytes',
+        'Default setup memory budget (in bytes) of all lambda fixtures',
+        default=None,
+    )
+    parser.addini(
+        'lambda_fork_workers',
+        'Default maximum number of forked children running tests using a '
+        'fork_fixture at once (default: 1)',
+        default='1',
+    )
+    parser.addini(
+        'lambda_regression_ratio',
+        'Ratio of current to baseline setup cost considered a regression',
+        default='5',
+    )
+
+
+def pytest_configure(config):
+    from pytest_lambda.background import BackgroundLoopCloser
+    from pytest_lambda.failfast import LambdaFailFast
+
+    # Otherwise, setup costs are only measured once a budgeted fixture is collected
+    if (
+        config.getini('lambda_budget_ms')
+        or config.getini('lambda_budget_bytes')
+        or config.getoption('lambda_baseline')
+        or config.getoption('lambda_reorder')
+        or config.getoption('lambda_affinity')
+    ):
+        enable_setup_costs(config)
+
+    config.pluginmanager.register(BackgroundLoopCloser(), 'lambda-background-loop')
+    config.pluginmanager.register(LambdaFailFast(config), 'lambda-failfast')
+    config.pluginmanager.register(LambdaConftestScanner(config), 'lambda-conftests')
+    enable_fork_runner(config)
+
+    if config.getoption('lambda_reorder'):
+        from pytest_lambda.reorder import LambdaFixtureReorderer
+
+        # Setup costs of this run will be used to weigh fixtures in future runs
+        enable_setup_costs(config).persist = True
+        config.pluginmanager.register(LambdaFixtureReorderer(config), 'lambda-reorderer')
+
+    if config.getoption('lambda_affinity'):
+        from pytest_lambda.scheduling import LambdaAffinityRecorder
+
+        enable_setup_costs(config).persist = True
+        affinity = LambdaAffinityRecorder(config, config.getoption('lambda_affinity_min_ms'))
+        config.pluginmanager.register(affinity, 'lambda-affinity')
+
+    if config.getoption('lambda_changed'):
+        from pytest_lambda.changes import LambdaChangeSelector
+
+        config.pluginmanager.register(LambdaChangeSelector(config), 'lambda-changed')
+
+    trace_path = config.getoption('lambda_trace')
+    if trace_path:
+        from pytest_lambda.tracing import LambdaFixtureTracer
+
+        tracer = LambdaFixtureTracer(config, Path(os.path.abspath(trace_path)))
+        config.pluginmanager.register(tracer, 'lambda-tracer')
+
+    profile_pattern = config.getoption('lambda_profile')
+    if profile_pattern:
+        from pytest_lambda.profiling import LambdaFixtureProfiler
+
+        output_dir = Path(config.rootdir) / config.getoption('lambda_profile_dir')
+        profiler = LambdaFixtureProfiler(config, profile_pattern, output_dir)
+        config.pluginmanager.register(profiler, 'lambda-profiler')
+
+
+def enable_setup_costs(config):
+    """Register the setup cost recorder and budget enforcement, if not yet registered
+
+    Returns the SetupCostRecorder.
+    """
+    from pytest_lambda.budgets import LambdaFixtureBudgets
+    from pytest_lambda.costs import SetupCostRecorder
+
+    recorder = config.pluginmanager.get_plugin('lambda-setup-costs')
+    if recorder is not None:
+        return recorder
+
+    recorder = SetupCostRecorder(config)
+    config.pluginmanager.register(recorder, 'lambda-setup-costs')
+
+    default_budget_ms = config.getini('lambda_budget_ms')
+    default_budget_bytes = config.getini('lambda_budget_bytes')
+    regression_ratio = config.getoption('lambda_regression_ratio')
+    if regression_ratio is None:
+        regression_ratio = float(config.getini('lambda_regression_ratio'))
+
+    budgets = LambdaFixtureBudgets(
+        config,
+        recorder,
+        default_budget_ms=float(default_budget_ms) if default_budget_ms else None,
+        default_budget_bytes=int(default_budget_bytes) if default_budget_bytes else None,
+        baseline_mode=config.getoption('lambda_baseline'),
+        regression_ratio=regression_ratio,
+    )
+    config.pluginmanager.register(budgets, 'lambda-budgets')
+    return recorder
+
+
+def enable_fork_runner(config) -> None:
+    """Register the runner of tests using fork fixtures
+
+    The runner relies upon pytest internals which took their current form in
+    pytest 7.0. With older versions (as on platforms without os.fork()), tests using
+    fork fixtures run in-process.
+    """
+    from pytest_lambda.forking import LambdaForkRunner
+
+    if PYTEST_VERSION < (7, 0) or not hasattr(os, 'fork'):
+        return
+
+    fork_runner = LambdaForkRunner(config, max_workers=int(config.getini('lambda_fork_workers')))
+    config.pluginmanager.register(fork_runner, 'lambda-fork-runner')
+
+
+class LambdaConftestScanner:
+    """Process the lambda fixtures of conftest.py files, as those of test modules
+
+    Conftest modules aren't collected like test modules, so they're scanned as they
+    are registered as plugins, instead (including those registered before this).
+    This happens before pytest parses their fixtures.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_plugin_registered(self, plugin) -> None:
+        if is_conftest_module(plugin):
+            process_lambda_fixtures(plugin)
+            enable_plugins_for_fixtures(self.config, plugin)
+
+
+def is_conftest_module(plugin) -> bool:
+    return (
+        isinstance(plugin, ModuleType)
+        and os.path.basename(getattr(plugin, '__file__', None) or '') == 'conftest.py'
+    )
 
 
 def pytest_collectstart(collector):
     if isinstance(collector, Module):
         process_lambda_fixtures(collector.module)
+        enable_plugins_for_fixtures(collector.config, collector.module)
 
 
 def pytest_pycollect_makeitem(collector, name, obj):
     if inspect.isclass(obj):
         process_lambda_fixtures(obj)
+        enable_plugins_for_fixtures(collector.config, obj)
+
+
+def enable_plugins_for_fixtures(config, parent) -> None:
+    """Register the plugins required by the lambda fixtures declared in a class/module"""
+    for obj in vars(parent).values():
+        if not isinstance(obj, LambdaFixture):
+            continue
+
+        if obj.budget_ms is not None or obj.budget_bytes is not None:
+            enable_setup_costs(config)
 
 
 def process_lambda_fixtures(parent):
@@ -24,8 +300,11 @@ def process_lambda_fixtures(parent):
     lfix_attrs: List[Tuple[str, LambdaFixture]] = (
         inspect.getmembers(parent, lambda o: isinstance(o, LambdaFixture)))
 
-    for name, attr in lfix_attrs:
-        attr.contribute_to_parent(parent, name)
+    # NOTE: the lock is held throughout, so the destructured fixtures of a param
+    #       source are all contributed to the same parent
+    with _contribution_lock:
+        for name, attr in lfix_attrs:
+            attr.contribute_to_parent(parent, name)
 
     return parent
 
@@ -44,7 +323,8 @@ def pytest_generate_tests(metafunc: Metafunc) -> None:
             assert a < b < c
 
     """
-    param_sources: Set[LambdaFixture] = set()
+    # NOTE: a dict is used (instead of a set) to parametrize in a deterministic order
+    param_sources: Dict[LambdaFixture, None] = {}
 
     for argname in metafunc.fixturenames:
         # Get the FixtureDefs for the argname.
@@ -56,13 +336,35 @@ def pytest_generate_tests(metafunc: Metafunc) -> None:
 
         for fixturedef in reversed(fixture_defs):
             param_source = getattr(fixturedef.func, '_self_params_source', None)
-            if param_source:
-                param_sources.add(param_source)
+            if isinstance(fixturedef.func, (BatchLambdaFixture, LazyLambdaFixture)):
+                param_source = fixturedef.func
+                if param_source.index_name is None:
+                    raise ValueError(
+                        f'Lambda fixture {argname!r} must be declared in a test module, '
+                        f'test class, or conftest.py, to be parametrized by param index '
+                        f'(as with lazy=True and batch_fixture)')
+            if param_source is not None:
+                param_sources[param_source] = None
 
     if param_sources:
         requested_fixturenames = set(metafunc.fixturenames)
 
+        parametrizations: List[_Parametrization] = []
+
         for param_source in param_sources:
+            if isinstance(param_source, (BatchLambdaFixture, LazyLambdaFixture)):
+                # Tests are parametrized by the index of each param, which the
+                # fixture uses to look up (or build) the value of its param.
+                assert param_source.index_name is not None
+                parametrizations.append((
+                    param_source,
+                    (param_source.index_name,),
+                    param_source.get_index_params(),
+                    param_source.index_scope,
+                    None,
+                ))
+                continue
+
             if param_source.fixture_kwargs['params'] is None:
                 continue
 
@@ -76,9 +378,125 @@ def pytest_generate_tests(metafunc: Metafunc) -> None:
                     metafunc.fixturenames.append(child_name)
                     requested_fixturenames.add(child_name)
 
-            metafunc.parametrize(
+            parametrizations.append((
+                param_source,
                 params_iter.child_names,
-                param_source.fixture_kwargs['params'],
-                scope=param_source.fixture_kwargs.get('scope'),
-                ids=param_source.fixture_kwargs.get('ids'),
-            )
+                cast(Sequence, param_source.fixture_kwargs['params']),
+                param_source.fixture_kwargs.get('scope'),
+                param_source.fixture_kwargs.get('ids'),
+            ))
+
+        strength = get_combine_strength(metafunc.config, [p[0] for p in parametrizations])
+        if strength is not None and len(parametrizations) > strength:
+            parametrize_combined(metafunc, parametrizations, strength)
+        else:
+            for _, argnames, params, scope, ids in parametrizations:
+                metafunc.parametrize(argnames, params, scope=scope, ids=ids)
+
+        for param_source, argnames, params, _, ids in parametrizations:
+            record_param_source(metafunc, param_source, argnames, params, ids)
+
+
+def get_combine_strength(config, param_sources: Sequence[LambdaFixture]) -> Optional[int]:
+    """Determine the n-wise strength to combine a test's param sources with
+
+    None denotes the full Cartesian product. The strongest combine mode requested by
+    any of the param sources is used, falling back to the lambda_combine ini setting.
+    """
+    explicit = [source.combine for source in param_sources if source.combine is not None]
+    if not explicit:
+        return parse_combine_strength(config.getini('lambda_combine') or None)
+
+    strengths = [parse_combine_strength(combine) for combine in explicit]
+    if None in strengths:
+        return None
+    return max(strengths)  # type: ignore[type-var]
+
+
+def parametrize_combined(
+    metafunc: Metafunc,
+    parametrizations: Sequence[_Parametrization],
+    strength: int,
+) -> None:
+    """Parametrize a test with covering arrays over the params of its param sources
+
+    Rather than the full Cartesian product of the param sources, each combination of
+    params from any `strength` param sources is included at least once.
+
+    Only param sources of the same scope are combined with each other, so each is
+    still parametrized at its own scope (otherwise, higher-scoped fixtures requesting
+    a higher-scoped source would depend on narrower-scoped params). Param sources of
+    different scopes are combined with each other by full product.
+    """
+    by_scope: Dict['_Scope', List[_Parametrization]] = {}
+    for parametrization in parametrizations:
+        scope = parametrization[3] or 'function'
+        by_scope.setdefault(scope, []).append(parametrization)
+
+    full_product = 1
+    num_combinations = 1
+    for scope, group in by_scope.items():
+        if len(group) <= strength:
+            for _, argnames, params, _, ids in group:
+                metafunc.parametrize(argnames, params, scope=scope, ids=ids)
+                full_product *= len(params)
+                num_combinations *= len(params)
+            continue
+
+        group_product, num_rows = parametrize_covering_array(metafunc, group, strength, scope)
+        full_product *= group_product
+        num_combinations *= num_rows
+
+    stats = getattr(metafunc.config, '_lambda_combine_stats', None)
+    if stats is None:
+        stats = metafunc.config._lambda_combine_stats = []  # type: ignore[attr-defined]
+    stats.append((full_product, num_combinations))
+
+
+def parametrize_covering_array(
+    metafunc: Metafunc,
+    parametrizations: Sequence[_Parametrization],
+    strength: int,
+    scope: '_Scope',
+) -> Tuple[int, int]:
+    """Parametrize a test with a covering array over the params of same-scoped sources
+
+    Returns the size of the full product of the params, and the number of rows used.
+    """
+    all_argnames: List[str] = []
+    all_param_sets: List[List[ParameterSet]] = []
+    for _, argnames, params, _, ids in parametrizations:
+        all_argnames.extend(argnames)
+        all_param_sets.append(build_param_sets(params, ids, argnames))
+
+    rows = covering_array([len(param_sets) for param_sets in all_param_sets], strength)
+
+    combined_params = []
+    for row in rows:
+        param_sets = [all_param_sets[i][index] for i, index in enumerate(row)]
+        combined_params.append(pytest.param(
+            *(value for param_set in param_sets for value in param_set.values),
+            id='-'.join(str(param_set.id) for param_set in param_sets),
+            marks=[mark for param_set in param_sets for mark in param_set.marks],
+        ))
+
+    metafunc.parametrize(all_argnames, combined_params, scope=scope)
+
+    full_product = 1
+    for param_sets in all_param_sets:
+        full_product *= len(param_sets)
+    return full_product, len(rows)
+
+
+def pytest_report_collectionfinish(config, items):
+    stats = getattr(config, '_lambda_combine_stats', None)
+    if not stats:
+        return None
+
+    full = sum(full_product for full_product, _ in stats)
+    reduced = sum(num_rows for _, num_rows in stats)
+    return (
+        f'lambda-combine: {len(stats)} test functions parametrized with {reduced} of '
+        f'{full} combinations ({reduced / full:.1%} of the full product, '
+        f'{full / reduced:.1f}x reduction)'
+    )
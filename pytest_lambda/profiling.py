@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import cProfile
+import fnmatch
+import os
+import pstats
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+from pytest_lambda.impl import get_fixture_key, is_lambda_fixture_func
+
+__all__ = ['LambdaFixtureProfiler', 'write_collapsed_stacks']
+
+
+# (filename, lineno, funcname), as used by pstats
+_FuncKey = Tuple[str, int, str]
+
+
+class LambdaFixtureProfiler:
+    """Profile the setup of lambda fixtures matching a glob with cProfile
+
+    Only one cProfile.Profile may be active at a time, and fixture setups nest
+    (a fixture's dependencies are set up within its own setup on older pytest
+    versions). A stack of active profilers is maintained, so that a fixture's
+    profile only contains the time spent in its own setup: whenever another fixture
+    begins setup, the enclosing profiler is paused until it finishes.
+
+    Setups are only profiled in one thread at a time (on Python 3.12+, cProfile
+    can't be active in several threads at once). Matching setups begun by other
+    threads meanwhile aren't profiled; they're counted in `skipped`, instead.
+
+    Repeated setups of the same fixture (e.g. function-scoped fixtures, or
+    parametrized fixtures) accumulate in the same profiler.
+    """
+
+    def __init__(self, config: pytest.Config, pattern: str, output_dir: Path):
+        self.config = config
+        self.patterns = [p.strip() for p in pattern.split(',') if p.strip()]
+        self.output_dir = output_dir
+
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.skipped: Dict[str, int] = {}
+        self.written: List[Path] = []
+
+        # Stack of the profilers of in-progress setups (None if unmatched), of the
+        # thread currently profiling
+        self._stack: List[Optional[cProfile.Profile]] = []
+        self._owner: Optional[int] = None
+        self._lock = threading.Lock()
+        self._matches: Dict[int, Optional[str]] = {}
+
+    def _acquire(self, key: str) -> bool:
+        """Make the current thread the one profiling, unless another one already is"""
+        with self._lock:
+            if self._owner is None:
+                self._owner = threading.get_ident()
+                return True
+
+            self.skipped[key] = self.skipped.get(key, 0) + 1
+            return False
+
+    def _get_matching_key(self, fixturedef) -> Optional[str]:
+        # Cache the result of the match per FixtureDef, so non-matching fixtures
+        # only pay for a dict lookup on subsequent setups
+        try:
+            return self._matches[id(fixturedef)]
+        except KeyError:
+            pass
+
+        key: Optional[str] = None
+        if is_lambda_fixture_func(fixturedef.func):
+            candidate = get_fixture_key(fixturedef)
+            if any(fnmatch.fnmatchcase(fixturedef.argname, pattern)
+                   or fnmatch.fnmatchcase(candidate, pattern)
+                   for pattern in self.patterns):
+                key = candidate
+
+        self._matches[id(fixturedef)] = key
+        return key
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request) -> Iterator[None]:
+        key = self._get_matching_key(fixturedef)
+        if self._owner != threading.get_ident() and (key is None or not self._acquire(key)):
+            yield
+            return
+
+        stack = self._stack
+
+        enclosing = stack[-1] if stack else None
+        if enclosing is not None:
+            enclosing.disable()
+
+        profiler = None
+        if key is not None:
+            profiler = self.profiles.get(key)
+            if profiler is None:
+                profiler = self.profiles.setdefault(key, cProfile.Profile())
+
+        stack.append(profiler)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            stack.pop()
+
+            if enclosing is not None:
+                enclosing.enable()
+            elif not stack:
+                self._owner = None
+
+    def pytest_sessionfinish(self, session) -> None:
+        if not self.profiles:
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        worker_id = os.environ.get('PYTEST_XDIST_WORKER')
+        for key, profiler in sorted(self.profiles.items()):
+            basename = _sanitize_filename(key)
+            if worker_id:
+                basename = f'{basename}.{worker_id}'
+
+            pstats_path = self.output_dir / f'{basename}.pstats'
+            profiler.dump_stats(str(pstats_path))
+
+            collapsed_path = self.output_dir / f'{basename}.collapsed'
+            write_collapsed_stacks(pstats.Stats(profiler), collapsed_path)
+
+            self.written.extend((pstats_path, collapsed_path))
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.written and not self.skipped:
+            return
+
+        terminalreporter.write_sep('-', 'lambda fixture profiles')
+        for path in self.written:
+            terminalreporter.write_line(str(path))
+        for key, count in sorted(self.skipped.items()):
+            terminalreporter.write_line(
+                f'{key}: {count} setup(s) not profiled, as another thread was profiling')
+
+
+def write_collapsed_stacks(stats: pstats.Stats, path: Path) -> None:
+    """Write profile stats in the "collapsed stack" format read by flamegraph tools
+
+    cProfile only records caller→callee edges, not complete call stacks. Stacks
+    are reconstructed by walking from each root function down through its
+    callees, apportioning each callee's time by the fraction of it attributed
+    to the calling edge. Each output line is a semicolon-separated stack,
+    followed by its self time in microseconds.
+    """
+    raw_stats = stats.stats  # type: ignore[attr-defined]
+
+    callees: Dict[_FuncKey, Dict[_FuncKey, float]] = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in raw_stats.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, {})[func] = caller_stats[3]
+
+    samples: Dict[str, float] = {}
+
+    def visit(func: _FuncKey, path: Tuple[str, ...], share: float) -> None:
+        _cc, _nc, tottime, cumtime, _callers = raw_stats[func]
+        fraction = share / cumtime if cumtime else 0.0
+
+        stack = path + (_format_func(func),)
+        frame = ';'.join(stack)
+        samples[frame] = samples.get(frame, 0.0) + tottime * fraction
+
+        for callee, edge_cumtime in callees.get(func, {}).items():
+            if callee not in raw_stats or _format_func(callee) in path:
+                continue  # avoid infinite descent into recursive calls
+            visit(callee, stack, edge_cumtime * fraction)
+
+    roots = [func for func, func_stats in raw_stats.items() if not func_stats[4]]
+    for root in roots:
+        visit(root, (), raw_stats[root][3])
+
+    with open(path, 'w') as fp:
+        for frame, seconds in sorted(samples.items()):
+            microseconds = int(round(seconds * 1e6))
+            if microseconds > 0:
+                fp.write(f'{frame} {microseconds}\n')
+
+
+def _format_func(func: _FuncKey) -> str:
+    filename, lineno, funcname = func
+    if filename == '~' and lineno == 0:
+        # Builtins are recorded as ('~', 0, '<built-in method ...>')
+        return funcname
+    return f'{funcname} ({os.path.basename(filename)}:{lineno})'
+
+
+def _sanitize_filename(key: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', key).strip('_')
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+from pytest_lambda.collection import (
+    get_dependent_fixturedefs,
+    get_param_dependencies,
+    get_param_index,
+    get_param_sources,
+    get_scope_node_id,
+)
+from pytest_lambda.costs import SETUP_COSTS_CACHE_KEY
+from pytest_lambda.impl import LazyLambdaFixture, _LambdaFixtureParametrizedIterator, get_fixture_key
+from pytest_lambda.workers import load_cached
+
+__all__ = ['LambdaFixtureReorderer', 'count_setups']
+
+
+# (fixture key, nodeid of the scope bounding the fixture)
+_SlotKey = Tuple[str, str]
+# A single setup of a fixture in a slot: the slot, and the param indices it was set up with
+_SetupUnit = Tuple[_SlotKey, Tuple[int, ...]]
+
+
+class LambdaFixtureReorderer:
+    """Reorder tests to minimize re-setups of higher-scoped parametrized lambda fixtures
+
+    pytest tears down a higher-scoped (e.g. module) fixture whenever the next test
+    requests it with a different param. When tests are parametrized by destructured
+    lambda fixtures, each param of the source is a distinct setup of every
+    higher-scoped fixture depending on it; ordering tests so those params are
+    grouped avoids tearing down and rebuilding the same instance.
+
+    Within each module/class (tests are never moved across them, to avoid churning
+    fixtures bounded by those scopes), tests are grouped by the param of each
+    higher-scoped param source, with the sources whose dependents were most
+    expensive to set up in previous runs (as stored in the cache) taking priority.
+    """
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.costs = load_cached(config, SETUP_COSTS_CACHE_KEY)
+
+        self.setups_before: Optional[int] = None
+        self.setups_after: Optional[int] = None
+        self.cost_saved = 0.0
+
+    def get_setup_units(self, item: pytest.Item) -> List[Tuple[_SetupUnit, float]]:
+        """Return the higher-scoped parametrized setups item requires, with their costs
+
+        Each param source is a setup unit of its own, keyed by its param index. Each
+        higher-scoped fixture depending on param sources is also a unit, keyed by the
+        param indices of all the sources it depends on, as it must be set up anew
+        whenever any of them changes.
+        """
+        callspec = getattr(item, 'callspec', None)
+        if callspec is None:
+            return []
+
+        # Param index of each higher-scoped param source, by child name
+        child_indices: Dict[str, Tuple[int, int]] = {}
+
+        units: List[Tuple[_SetupUnit, float]] = []
+        for source in get_param_sources(item):
+            scope = source.fixture_kwargs.get('scope') or 'function'
+            if scope == 'function':
+                continue
+
+            param_index = get_param_index(item, source)
+            if param_index is None:
+                continue
+
+            params_iter = source._self_iter
+            assert isinstance(params_iter, _LambdaFixtureParametrizedIterator)
+            child_names = params_iter.child_names
+            if isinstance(source, LazyLambdaFixture):
+                # Tests are parametrized by the index of the lazy params, instead
+                assert source.index_name is not None
+                child_names = (source.index_name,)
+
+            for child_name in child_names:
+                child_indices[child_name] = (id(source), param_index)
+
+            slot = (f'<params:{id(source)}>', get_scope_node_id(item, scope))
+            units.append(((slot, (param_index,)), 0.0))
+
+        if not child_indices:
+            return units
+
+        for fixturedef in get_dependent_fixturedefs(item, child_indices):
+            if fixturedef.scope == 'function':
+                continue
+
+            source_indices = dict(get_param_dependencies(item, fixturedef, child_indices))
+            slot = (get_fixture_key(fixturedef), get_scope_node_id(item, fixturedef.scope))
+            value = tuple(index for _, index in sorted(source_indices.items()))
+            cost = self.costs.get(get_fixture_key(fixturedef), {}).get('ms', 0.0)
+            units.append(((slot, value), cost))
+
+        return units
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items: List[pytest.Item]) -> None:
+        item_units = {item: self.get_setup_units(item) for item in items}
+        if not any(item_units.values()):
+            return
+
+        self.setups_before, cost_before = count_setups(items, item_units)
+
+        reordered: List[pytest.Item] = []
+        for group in _group_by_parent(items):
+            reordered.extend(self._reorder_group(group, item_units))
+
+        self.setups_after, cost_after = count_setups(reordered, item_units)
+        if (cost_after, self.setups_after) < (cost_before, self.setups_before):
+            items[:] = reordered
+            self.cost_saved = cost_before - cost_after
+        else:
+            self.setups_after = self.setups_before
+
+    def _reorder_group(
+        self,
+        items: List[pytest.Item],
+        item_units: Dict[pytest.Item, List[Tuple[_SetupUnit, float]]],
+    ) -> List[pytest.Item]:
+        # Total cost of each slot, and the order in which each param was first seen
+        slot_costs: Dict[_SlotKey, float] = {}
+        first_seen: Dict[_SlotKey, Dict[Tuple[int, ...], int]] = {}
+        for item in items:
+            for (slot, param_index), cost in item_units[item]:
+                slot_costs[slot] = slot_costs.get(slot, 0.0) + cost
+                seen = first_seen.setdefault(slot, {})
+                seen.setdefault(param_index, len(seen))
+
+        if not slot_costs:
+            return items
+
+        # Most expensive slots are grouped first; ties retain their order of appearance
+        slot_order = sorted(slot_costs, key=lambda slot: -slot_costs[slot])
+
+        def sort_key(item: pytest.Item) -> Tuple[int, ...]:
+            params = dict(unit for unit, _ in item_units[item])
+            key: List[int] = []
+            for slot in slot_order:
+                rank = first_seen[slot][params[slot]] if slot in params else -1
+                # Alternate the direction of less significant slots (boustrophedon
+                # order), so their param is retained across boundaries of more
+                # significant slots — e.g. (0, 0), (0, 1), (1, 1), (1, 0)
+                if sum(key) % 2:
+                    rank = -rank
+                key.append(rank)
+            return tuple(key)
+
+        # Tests which don't use any param sources retain their positions
+        positions = [i for i, item in enumerate(items) if item_units[item]]
+        reordered = list(items)
+        for position, item in zip(positions, sorted((items[i] for i in positions), key=sort_key)):
+            reordered[position] = item
+        return reordered
+
+    def pytest_report_collectionfinish(self, config, items):
+        if self.setups_before is None or self.setups_after is None:
+            return None
+
+        saved = self.setups_before - self.setups_after
+        return (
+            f'lambda-reorder: {self.setups_after} setups of parametrized lambda fixtures '
+            f'(saved {saved} of {self.setups_before} in original order, '
+            f'est. {self.cost_saved:.0f}ms)'
+        )
+
+
+def count_setups(
+    items: Sequence[pytest.Item],
+    item_units: Dict[pytest.Item, List[Tuple[_SetupUnit, float]]],
+) -> Tuple[int, float]:
+    """Count how many times higher-scoped params are set up when running items in order,
+    and the estimated total cost (in ms) of those setups
+
+    A fixture is set up whenever a test requests it while an instance with different
+    params is active in the same scope.
+    """
+    active: Dict[_SlotKey, Tuple[int, ...]] = {}
+    setups = 0
+    total_cost = 0.0
+    for item in items:
+        for (slot, param_indices), cost in item_units.get(item, ()):
+            if active.get(slot) != param_indices:
+                active[slot] = param_indices
+                setups += 1
+                total_cost += cost
+    return setups, total_cost
+
+
+def _group_by_parent(items: Sequence[pytest.Item]) -> List[List[pytest.Item]]:
+    """Split items into runs of consecutive items sharing the same parent collector"""
+    groups: List[List[pytest.Item]] = []
+    last_parent = object()
+    for item in items:
+        if item.parent is not last_parent:
+            groups.append([])
+            last_parent = item.parent
+        groups[-1].append(item)
+    return groups
+
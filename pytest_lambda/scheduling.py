@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional
+
+import pytest
+
+from pytest_lambda.collection import get_higher_scoped_instances
+from pytest_lambda.costs import SETUP_COSTS_CACHE_KEY
+from pytest_lambda.workers import WorkerOutputPlugin, load_cached
+
+try:
+    from xdist.scheduler import LoadScopeScheduling  # type: ignore[import]
+except ImportError:  # pytest-xdist is not installed
+    LoadScopeScheduling = object
+
+__all__ = ['LambdaAffinityScheduling', 'LambdaAffinityRecorder']
+
+
+#: Cache key under which the higher-scoped lambda fixture instances of each test are stored
+AFFINITY_CACHE_KEY = 'pytest_lambda/affinity'
+
+#: xdist distribution modes (--dist) which LambdaAffinityScheduling may replace
+AFFINITY_DIST_MODES = ('load', 'loadscope')
+
+
+class LambdaAffinityScheduling(LoadScopeScheduling):  # type: ignore[misc,valid-type]
+    """xdist scheduler sending tests which share expensive lambda fixtures to the same worker
+
+    xdist's load scheduler spreads tests across all workers, so each worker pays the
+    setup of every module/class/session-scoped fixture its tests request. This
+    scheduler groups tests sharing the same instance of an expensive higher-scoped
+    lambda fixture (the same fixture, scope, and params) into a single work unit,
+    which is run entirely by one worker.
+
+    Which fixture instances each test uses, and how expensive their setups were,
+    are recorded in the cache during previous runs. Tests are grouped by their most
+    expensive fixture instance, if its setup took at least min_ms. All other tests
+    are scheduled as with the load scheduler (individually), or, if by_scope, as with
+    the loadscope scheduler (by module/class). To keep load balanced, groups larger
+    than an even share of the collection per worker are split.
+    """
+
+    def __init__(self, config, log=None, *, min_ms: float = 10.0, by_scope: bool = False):
+        super().__init__(config, log)
+        self.min_ms = min_ms
+        self.by_scope = by_scope
+        self.affinities: Dict[str, List[List[str]]] = load_cached(config, AFFINITY_CACHE_KEY)
+        self.costs = load_cached(config, SETUP_COSTS_CACHE_KEY)
+        self._scopes: Optional[Dict[str, str]] = None
+
+    def _get_affinity_group(self, nodeid: str) -> Optional[str]:
+        best_cost = self.min_ms
+        best_group = None
+        for fixture_key, scope_node_id, param_id in self.affinities.get(nodeid, ()):
+            cost = self.costs.get(fixture_key, {}).get('ms', 0.0)
+            if cost >= best_cost:
+                best_cost = cost
+                best_group = f'{fixture_key}@{scope_node_id}[{param_id}]'
+        return best_group
+
+    def _compute_scopes(self) -> Dict[str, str]:
+        collection = self.collection or []
+        max_group_size = max(math.ceil(len(collection) / max(len(self.nodes), 1)), 1)
+
+        scopes: Dict[str, str] = {}
+        group_sizes: Dict[str, int] = {}
+        for nodeid in collection:
+            group = self._get_affinity_group(nodeid)
+            if group is None:
+                scopes[nodeid] = super()._split_scope(nodeid) if self.by_scope else nodeid
+                continue
+
+            size = group_sizes[group] = group_sizes.get(group, 0) + 1
+            chunk = (size - 1) // max_group_size
+            scopes[nodeid] = f'{group}#{chunk}' if chunk else group
+
+        return scopes
+
+    def _split_scope(self, nodeid: str) -> str:
+        if self._scopes is None:
+            self._scopes = self._compute_scopes()
+        return self._scopes.get(nodeid, nodeid)
+
+
+class LambdaAffinityRecorder(WorkerOutputPlugin):
+    """Record the higher-scoped lambda fixture instances used by each test
+
+    These are stored in the cache for use by LambdaAffinityScheduling in later runs.
+    On xdist workers, they're shipped to the controller, which stores them.
+    """
+
+    def __init__(self, config: pytest.Config, min_ms: float = 10.0):
+        self.config = config
+        self.min_ms = min_ms
+        self.affinities: Dict[str, List[List[str]]] = {}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        dist = config.getvalue('dist')
+        if dist not in AFFINITY_DIST_MODES:
+            # Leave other distribution modes (e.g. --dist=each) to xdist
+            config.issue_config_time_warning(
+                pytest.PytestConfigWarning(
+                    f'--lambda-affinity only applies to --dist='
+                    f'{"/".join(AFFINITY_DIST_MODES)}; ignoring it for --dist={dist}'),
+                stacklevel=2,
+            )
+            return None
+        return LambdaAffinityScheduling(
+            config, log, min_ms=self.min_ms, by_scope=dist == 'loadscope')
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, session, config, items: List[pytest.Item]) -> None:
+        for item in items:
+            instances = get_higher_scoped_instances(item)
+            if instances:
+                self.affinities[item.nodeid] = [list(instance) for instance in instances]
+
+    workeroutput_key = 'lambda_affinity'
+
+    def get_worker_output(self) -> Dict[str, List[List[str]]]:
+        return self.affinities
+
+    def merge_worker_output(self, output: Dict[str, List[List[str]]]) -> None:
+        self.affinities.update(output)
+
+    def store(self, session) -> None:
+        cache = getattr(self.config, 'cache', None)  # (None with -p no:cacheprovider)
+        if self.affinities and cache is not None:
+            affinities = load_cached(self.config, AFFINITY_CACHE_KEY)
+            affinities.update(self.affinities)
+            cache.set(AFFINITY_CACHE_KEY, affinities)
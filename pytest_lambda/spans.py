@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Protocol
+
+__all__ = ['span', 'set_span_recorder']
+
+
+class SpanRecorder(Protocol):
+    def record_span(self, name: str, cat: str, start: float, end: float, args: Dict[str, Any]) -> None:
+        ...
+
+
+#: Receives spans timed within lambda fixtures (e.g. awaits), when --lambda-trace is passed
+_recorder: Optional[SpanRecorder] = None
+
+
+def set_span_recorder(recorder: Optional[SpanRecorder]) -> Optional[SpanRecorder]:
+    """Set the recorder receiving spans, returning the previous one"""
+    global _recorder
+    previous, _recorder = _recorder, recorder
+    return previous
+
+
+@contextmanager
+def span(name: str, cat: str, **args: Any) -> Iterator[None]:
+    """Time the enclosed block, reporting it to the span recorder (if there is one)
+
+    Times are measured with time.perf_counter().
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.record_span(name, cat, start, time.perf_counter(), args)
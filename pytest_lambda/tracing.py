@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import pytest
+
+import pytest_lambda
+from pytest_lambda.impl import _get_default_id, get_fixture_key, is_lambda_fixture_func
+from pytest_lambda.spans import set_span_recorder
+from pytest_lambda.workers import WorkerOutputPlugin
+
+__all__ = ['LambdaFixtureTracer']
+
+
+class LambdaFixtureTracer(WorkerOutputPlugin):
+    """Record a timeline of lambda fixture setups and teardowns in Chrome's trace event format
+
+    A complete ("X") event is recorded for each setup and teardown of lambda fixtures
+    (including wrap_fixture extensions), each await of an async lambda fixture's
+    value, and each call of the fixture wrapped by wrap_fixture. Each carries the
+    fixture's name, key, scope, and param id, and the id of the xdist worker (or
+    "main") — events are laid out by process and thread id.
+
+    Teardown spans begin in a finalizer added to the fixture once it's set up, which
+    pytest calls before any finalizers added during setup, and end when pytest
+    calls pytest_fixture_post_finalizer.
+
+    On xdist workers, events are shipped to the controller, which writes them all
+    to a single file, viewable with Perfetto (https://ui.perfetto.dev) or
+    chrome://tracing.
+    """
+
+    def __init__(self, config: pytest.Config, path: Path):
+        self.config = config
+        self.path = path
+        self.pid = os.getpid()
+
+        workerinput = getattr(config, 'workerinput', None)
+        self.worker_id = workerinput['workerid'] if workerinput else 'main'
+
+        self.events: List[Dict[str, Any]] = []
+        self.written = False
+
+        # perf_counter() is precise, but its epoch is arbitrary, so timestamps are
+        # offset to wall-clock time, to be comparable between xdist workers
+        self._clock_offset = time.time() - time.perf_counter()
+        self._lock = threading.Lock()
+        # Per-thread stack of the span args of in-progress setups
+        self._local = threading.local()
+        self._teardown_starts: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._previous_recorder = set_span_recorder(self)
+
+    @property
+    def _setup_stack(self) -> List[Dict[str, Any]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def pytest_unconfigure(self, config) -> None:
+        set_span_recorder(self._previous_recorder)
+
+    def record_span(self, name: str, cat: str, start: float, end: float, args: Dict[str, Any]) -> None:
+        """Record a complete event, from perf_counter() times start to end"""
+        setup_stack = self._setup_stack
+        if setup_stack:
+            # Spans within a setup (e.g. awaits) inherit the fixture's details
+            args = {**setup_stack[-1], **args}
+
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        event = {
+            'name': name,
+            'cat': cat,
+            'ph': 'X',
+            'ts': self._to_microseconds(start),
+            'dur': (end - start) * 1e6,
+            'pid': self.pid,
+            'tid': tid,
+            'args': {**args, 'worker': self.worker_id, 'thread': tid},
+        }
+        with self._lock:
+            self.events.append(event)
+            if tid not in self._thread_names:
+                self._thread_names[tid] = thread.name
+                self.events.append(_make_metadata_event('thread_name', self.pid, tid, thread.name))
+
+    def _to_microseconds(self, perf_counter_time: float) -> float:
+        return (perf_counter_time + self._clock_offset) * 1e6
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request) -> Generator[None, Any, None]:
+        if not is_lambda_fixture_func(fixturedef.func):
+            yield
+            return
+
+        args = _get_span_args(fixturedef, request)
+        setup_stack = self._setup_stack
+        setup_stack.append(args)
+        start = time.perf_counter()
+        try:
+            outcome = yield
+        finally:
+            end = time.perf_counter()
+            setup_stack.pop()
+
+        excinfo = outcome.excinfo
+        if excinfo is not None:
+            self.record_span(fixturedef.argname, 'setup', start, end, {**args, 'error': repr(excinfo[1])})
+        else:
+            self.record_span(fixturedef.argname, 'setup', start, end, args)
+            fixturedef.addfinalizer(functools.partial(self._start_teardown, fixturedef, args))
+
+    def _start_teardown(self, fixturedef, args: Dict[str, Any]) -> None:
+        self._teardown_starts[id(fixturedef)] = (time.perf_counter(), args)
+
+    def pytest_fixture_post_finalizer(self, fixturedef, request) -> None:
+        started = self._teardown_starts.pop(id(fixturedef), None)
+        if started is not None:
+            start, args = started
+            self.record_span(fixturedef.argname, 'teardown', start, time.perf_counter(), args)
+
+    workeroutput_key = 'lambda_trace'
+
+    def get_worker_output(self) -> List[Dict[str, Any]]:
+        return self._get_process_events()
+
+    def merge_worker_output(self, output: List[Dict[str, Any]]) -> None:
+        self.events.extend(output)
+
+    def store(self, session) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as fp:
+            json.dump({
+                'traceEvents': self._get_process_events(),
+                'displayTimeUnit': 'ms',
+                'otherData': {'generator': f'pytest-lambda {pytest_lambda.__version__}'},
+            }, fp)
+        self.written = True
+
+    def _get_process_events(self) -> List[Dict[str, Any]]:
+        process_name = 'pytest' if self.worker_id == 'main' else f'pytest {self.worker_id}'
+        return [_make_metadata_event('process_name', self.pid, 0, process_name)] + self.events
+
+    def pytest_terminal_summary(self, terminalreporter) -> None:
+        if not self.written:
+            return
+
+        num_spans = sum(1 for event in self.events if event['ph'] == 'X')
+        terminalreporter.write_sep('-', 'lambda fixture trace')
+        terminalreporter.write_line(f'{num_spans} spans written to {self.path}')
+
+
+def _make_metadata_event(name: str, pid: int, tid: int, value: str) -> Dict[str, Any]:
+    return {'name': name, 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': value}}
+
+
+def _get_span_args(fixturedef, request) -> Dict[str, Any]:
+    item = getattr(request, '_pyfuncitem', None)
+    return {
+        'fixture': get_fixture_key(fixturedef),
+        'scope': fixturedef.scope,
+        'param_id': _get_param_id(fixturedef, request),
+        'requested_by': item.nodeid if item is not None else None,
+    }
+
+
+def _get_param_id(fixturedef, request) -> Optional[str]:
+    """Return the id of the param a parametrized fixture is being set up with"""
+    if not hasattr(request, 'param'):
+        return None
+
+    index = request.param_index
+    ids = fixturedef.ids
+    if callable(ids):
+        param_id = ids(request.param)
+        if param_id is not None:
+            return str(param_id)
+    elif ids is not None and index < len(ids) and ids[index] is not None:
+        return str(ids[index])
+
+    return _get_default_id(request.param, fixturedef.argname, index)
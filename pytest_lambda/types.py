@@ -5,7 +5,10 @@ from typing import Any, Callable, Iterable, TYPE_CHECKING
 from .compat import TypedDict
 
 if TYPE_CHECKING:
-    from _pytest.fixtures import _Scope
+    from typing import Literal
+
+    # (pytest only names this type privately, and not under the same name in every version)
+    _Scope = Literal['session', 'package', 'module', 'class', 'function']
 
 
 class LambdaFixtureKwargs(TypedDict, total=False):
@@ -5,6 +5,8 @@ from typing import Callable, Iterable, Union
 from _pytest.compat import getfuncargnames, get_real_func
 from _pytest.fixtures import call_fixture_func
 
+from pytest_lambda.spans import span
+
 __all__ = ['wrap_fixture']
 
 
@@ -107,12 +109,15 @@ def wrap_fixture(
                     **fixture_args,
                     **overridden_args,
                 }
-                return call_fixture_func(fixturefunc, request, kwargs)
+                with span(request.fixturename, 'wrapped', wrapped=getattr(fixturefunc, '__name__', None)):
+                    return call_fixture_func(fixturefunc, request, kwargs)
 
             decorated_args[wrapped_param] = wrapped
             return call_fixture_func(fn, request, decorated_args)
 
         extension = build_wrapped_method(fn.__name__, all_arg_names, extension_impl)
+        # Allows the plugin to recognize wrap_fixture extensions (e.g. for profiling)
+        extension._wrapped_fixturefunc = fixturefunc  # type: ignore[attr-defined]
         return extension
 
     return decorator
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+import pytest
+
+__all__ = ['WorkerOutputPlugin', 'load_cached']
+
+
+class WorkerOutputPlugin(ABC):
+    """Base of plugins gathering data during a run, to be stored at session end
+
+    On xdist workers, the data gathered is shipped to the controller through
+    config.workeroutput, under workeroutput_key. The controller merges the data of
+    each worker as it goes down, then stores it all. Without xdist, the data is
+    stored directly.
+    """
+
+    #: Key of config.workeroutput used to ship data from xdist workers to the controller
+    workeroutput_key: str
+
+    config: pytest.Config
+
+    @abstractmethod
+    def get_worker_output(self) -> Any:
+        """Return the data gathered by this process, to be shipped to the controller"""
+
+    @abstractmethod
+    def merge_worker_output(self, output: Any) -> None:
+        """Merge in the data shipped by an xdist worker"""
+
+    @abstractmethod
+    def store(self, session: pytest.Session) -> None:
+        """Store the data gathered once the session finishes"""
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error) -> None:
+        workeroutput = getattr(node, 'workeroutput', {})
+        output = workeroutput.get(self.workeroutput_key)
+        if output is not None:
+            self.merge_worker_output(output)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session) -> None:
+        workeroutput = getattr(self.config, 'workeroutput', None)
+        if workeroutput is not None:
+            workeroutput[self.workeroutput_key] = self.get_worker_output()
+        else:
+            self.store(session)
+
+
+def load_cached(config: pytest.Config, key: str) -> Dict[str, Any]:
+    """Load the dict stored under key in the pytest cache (empty, if there's none)"""
+    cache = getattr(config, 'cache', None)
+    if cache is None:
+        return {}
+    return dict(cache.get(key, {}))
@@ -0,0 +1,12 @@
+import pytest
+
+from pytest_lambda.compat import PYTEST_VERSION
+
+
+def pytest_collection_modifyitems(items):
+    # The pytester fixture was only introduced in pytest 6.2
+    if PYTEST_VERSION < (6, 2):
+        skip_pytester = pytest.mark.skip(reason='requires pytest>=6.2 (for pytester)')
+        for item in items:
+            if 'pytester' in getattr(item, 'fixturenames', ()):
+                item.add_marker(skip_pytester)
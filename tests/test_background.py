@@ -0,0 +1,160 @@
+import asyncio
+import threading
+
+import pytest
+
+from pytest_lambda import background_proxy, lambda_fixture, run_in_background_loop
+
+
+class Client:
+    """Stand-in for an async client whose connections are bound to its event loop"""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.thread = threading.current_thread()
+
+    async def query(self, value):
+        # Awaiting on another loop raises, as with real loop-bound connections
+        assert asyncio.get_running_loop() is self.loop
+        await asyncio.sleep(0)
+        return value
+
+    def name(self):
+        return 'client'
+
+    async def connect(self):
+        await asyncio.sleep(0)
+        return Connection(self.loop)
+
+    def transaction(self):
+        return Transaction(self.loop)
+
+    async def stream(self, *values):
+        for value in values:
+            assert asyncio.get_running_loop() is self.loop
+            await asyncio.sleep(0)
+            yield value
+
+
+class Connection:
+    def __init__(self, loop):
+        self.loop = loop
+
+    async def query(self, value):
+        assert asyncio.get_running_loop() is self.loop
+        return value
+
+
+class Transaction:
+    def __init__(self, loop):
+        self.loop = loop
+        self.state = 'new'
+
+    async def __aenter__(self):
+        assert asyncio.get_running_loop() is self.loop
+        self.state = 'open'
+        return Connection(self.loop)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        assert asyncio.get_running_loop() is self.loop
+        self.state = 'closed'
+        return False
+
+
+async def create_client():
+    await asyncio.sleep(0)
+    return Client()
+
+
+client = lambda_fixture(lambda: create_client(), scope='session', background_loop=True)
+module_client = lambda_fixture(lambda: create_client(), scope='module', background_loop=True)
+dependent = lambda_fixture(lambda client: client.query('dependent'), scope='session', background_loop=True)
+
+
+def it_creates_value_on_background_thread(client):
+    assert client.thread is not threading.current_thread()
+    assert client.thread.name == 'pytest-lambda-event-loop'
+
+
+def it_shares_loop_between_scopes(client, module_client):
+    assert client.loop is module_client.loop
+
+
+def it_awaits_methods_on_background_loop_in_sync_tests(client):
+    assert client.query('sync') == 'sync'
+
+
+@pytest.mark.asyncio
+async def it_returns_awaitables_in_async_tests(client):
+    assert asyncio.get_running_loop() is not client.loop
+    assert await client.query('async') == 'async'
+
+
+def it_proxies_awaited_results_in_sync_tests(client):
+    connection = client.connect()
+    assert connection.query('sync') == 'sync'
+
+
+@pytest.mark.asyncio
+async def it_proxies_awaited_results_in_async_tests(client):
+    connection = await client.connect()
+    assert await connection.query('async') == 'async'
+
+
+@pytest.mark.asyncio
+async def it_enters_async_context_managers_on_background_loop(client):
+    transaction = client.transaction()
+    async with transaction as connection:
+        assert transaction.state == 'open'
+        assert await connection.query('in transaction') == 'in transaction'
+    assert transaction.state == 'closed'
+
+
+@pytest.mark.asyncio
+async def it_iterates_async_iterators_on_background_loop(client):
+    assert [value async for value in client.stream(1, 2, 3)] == [1, 2, 3]
+
+
+def it_calls_sync_methods_directly(client):
+    assert client.name() == 'client'
+
+
+def it_passes_awaitables_through_within_background_loop(dependent):
+    assert dependent == 'dependent'
+
+
+def it_runs_awaitables_with_helper(client):
+    async def query_twice():
+        return [await client.query(1), await client.query(2)]
+
+    assert run_in_background_loop(query_twice()) == [1, 2]
+
+
+def it_does_not_proxy_plain_values():
+    assert type(background_proxy(1)) is int
+    assert background_proxy(None) is None
+
+
+BACKGROUND_SUITE = '''
+    import asyncio
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    async def create_loop_bound():
+        return asyncio.get_running_loop()
+
+    loop = lambda_fixture(lambda: create_loop_bound(), scope='session', background_loop=True)
+
+    @pytest.mark.parametrize('i', range(3))
+    @pytest.mark.asyncio
+    async def test_uses_same_loop(loop, i):
+        assert loop.is_running()
+        assert asyncio.get_running_loop() is not loop
+'''
+
+
+def it_supports_function_scoped_asyncio_loops(pytester):
+    pytester.makepyfile(test_background_loop=BACKGROUND_SUITE)
+
+    result = pytester.runpytest_subprocess('-p', 'asyncio', '--asyncio-mode=strict')
+    result.assert_outcomes(passed=3)
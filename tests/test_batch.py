@@ -0,0 +1,107 @@
+import textwrap
+
+import pytest
+
+from pytest_lambda import batch_fixture, static_fixture
+
+
+builder_calls = []
+multiplier = static_fixture(10, scope='module')
+
+multiplied = batch_fixture(
+    lambda values, multiplier: builder_calls.append(values) or [v * multiplier for v in values],
+    params=[1, 2, 3],
+)
+
+
+def it_passes_each_test_the_result_of_its_param(multiplied, request):
+    expected = int(request.node.callspec.id) * 10
+    actual = multiplied
+    assert expected == actual
+
+
+def it_calls_builder_once_with_all_params():
+    expected = [[1, 2, 3]]
+    actual = builder_calls
+    assert expected == actual
+
+
+upper, doubled = batch_fixture(
+    lambda pairs: [(letter.upper(), number * 2) for letter, number in pairs],
+    params=[
+        pytest.param('a', 1, id='ayy'),
+        pytest.param('b', 2, id='bee'),
+    ],
+)
+
+
+def it_processes_destructured_batch_fixture(upper, doubled, request):
+    expected = {'ayy': ('A', 2), 'bee': ('B', 4)}[request.node.callspec.id]
+    actual = (upper, doubled)
+    assert expected == actual
+
+
+class TestClass:
+    labelled = batch_fixture(lambda values: values, params=['x', 'y'], ids=['ex', 'why'], scope='class')
+
+    def it_uses_ids_of_batch_fixture(self, labelled, request):
+        expected = {'ex': 'x', 'why': 'y'}[request.node.callspec.id]
+        actual = labelled
+        assert expected == actual
+
+
+def it_supports_batch_fixtures_imported_into_several_modules(pytester):
+    pytester.makepyfile(shared_batches='''
+        import pytest
+        from pytest_lambda import batch_fixture
+
+        doubled = batch_fixture(lambda values: [v * 2 for v in values], params=[1, 2])
+        upper, lower = batch_fixture(
+            lambda pairs: [(a.upper(), b.lower()) for a, b in pairs],
+            params=[pytest.param('a', 'B')],
+        )
+    ''')
+    for module_name in ('test_first_importer', 'test_second_importer'):
+        pytester.makepyfile(**{module_name: '''
+            from shared_batches import doubled, upper, lower
+
+            def test_doubled(doubled):
+                assert doubled in (2, 4)
+
+            def test_destructured(upper, lower):
+                assert (upper, lower) == ('A', 'b')
+        '''})
+    pytester.syspathinsert()
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=6)
+
+
+def it_supports_batch_fixtures_declared_in_conftest(pytester):
+    pytester.makeconftest('''
+        from pytest_lambda import batch_fixture
+
+        doubled = batch_fixture(lambda values: [v * 2 for v in values], params=[1, 2])
+    ''')
+    pytester.makepyfile(test_root='''
+        def test_doubled(doubled):
+            assert doubled in (2, 4)
+    ''')
+    # Conftests of subdirectories are only registered during collection
+    pytester.mkpydir('sub')
+    pytester.path.joinpath('sub', 'conftest.py').write_text(textwrap.dedent('''
+        import pytest
+        from pytest_lambda import batch_fixture
+
+        upper, lower = batch_fixture(
+            lambda pairs: [(a.upper(), b.lower()) for a, b in pairs],
+            params=[pytest.param('a', 'B')],
+        )
+    '''))
+    pytester.path.joinpath('sub', 'test_sub.py').write_text(textwrap.dedent('''
+        def test_destructured(doubled, upper, lower):
+            assert (upper, lower) == ('A', 'b')
+    '''))
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=4)
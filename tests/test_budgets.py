@@ -0,0 +1,155 @@
+def it_errors_when_fixture_exceeds_time_budget(pytester):
+    pytester.makepyfile(test_budgeted='''
+        import time
+        from pytest_lambda import lambda_fixture
+
+        slow = lambda_fixture(lambda: time.sleep(0.05), budget_ms=1)
+        fast = lambda_fixture(lambda: None, budget_ms=1000)
+
+        def test_slow(slow):
+            pass
+
+        def test_fast(fast):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines([
+        '*FixtureBudgetExceededError*slow*',
+        '*lambda fixture budgets*',
+        '*test_budgeted.py::slow: setup took *ms (budget: 1ms)',
+    ])
+
+
+def it_measures_setup_costs_only_when_budgets_are_used(pytester):
+    pytester.makepyfile(test_unbudgeted='''
+        from pytest_lambda import lambda_fixture
+
+        plain = lambda_fixture(lambda: 'plain')
+
+        def test_no_recorder(plain, request):
+            assert request.config.pluginmanager.get_plugin('lambda-setup-costs') is None
+            assert request.config.pluginmanager.get_plugin('lambda-budgets') is None
+    ''')
+    pytester.makepyfile(test_budgeted_late='''
+        from pytest_lambda import lambda_fixture
+
+        budgeted = lambda_fixture(lambda: 'budgeted', budget_ms=1000)
+
+        def test_recorder(budgeted, request):
+            assert request.config.pluginmanager.get_plugin('lambda-setup-costs') is not None
+    ''')
+
+    result = pytester.runpytest('test_unbudgeted.py')
+    result.assert_outcomes(passed=1)
+
+    result = pytester.runpytest('test_budgeted_late.py')
+    result.assert_outcomes(passed=1)
+
+
+def it_errors_when_conftest_fixture_exceeds_time_budget(pytester):
+    pytester.makeconftest('''
+        import time
+        from pytest_lambda import lambda_fixture
+
+        slow = lambda_fixture(lambda: time.sleep(0.05), budget_ms=1)
+    ''')
+    pytester.makepyfile(test_budgeted_conftest='''
+        def test_slow(slow):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines([
+        '*FixtureBudgetExceededError*slow*',
+        '*lambda fixture budgets*',
+        '*slow: setup took *ms (budget: 1ms)',
+    ])
+
+
+def it_errors_every_test_using_higher_scoped_fixture_over_budget(pytester):
+    pytester.makepyfile(test_budgeted='''
+        import time
+        from pytest_lambda import lambda_fixture
+
+        slow = lambda_fixture(lambda: time.sleep(0.05), budget_ms=1, scope='module')
+
+        def test_first(slow):
+            pass
+
+        def test_second(slow):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=2)
+    result.stdout.fnmatch_lines(['*lambda fixture budgets*', '*test_budgeted.py::slow: setup took *ms*'])
+
+
+def it_errors_when_fixture_exceeds_memory_budget(pytester):
+    pytester.makepyfile(test_budgeted='''
+        from pytest_lambda import lambda_fixture
+
+        big = lambda_fixture(lambda: bytearray(1_000_000), budget_bytes=1000)
+
+        def test_big(big):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(['*big: setup allocated * bytes (budget: 1000 bytes)*'])
+
+
+def it_applies_global_ini_budget(pytester):
+    pytester.makeini('''
+        [pytest]
+        lambda_budget_ms = 1
+    ''')
+    pytester.makepyfile(test_budgeted='''
+        import time
+        from pytest_lambda import lambda_fixture
+
+        slow = lambda_fixture(lambda: time.sleep(0.05))
+        exempt = lambda_fixture(lambda: time.sleep(0.05), budget_ms=10_000)
+
+        def test_slow(slow):
+            pass
+
+        def test_exempt(exempt):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1, errors=1)
+
+
+def it_fails_session_on_regression_from_baseline(pytester, monkeypatch):
+    pytester.makepyfile(test_baseline='''
+        import os, time
+        from pytest_lambda import lambda_fixture
+
+        sleepy = lambda_fixture(lambda: time.sleep(float(os.environ['SLEEP_SECONDS'])))
+
+        def test_it(sleepy):
+            pass
+    ''')
+
+    monkeypatch.setenv('SLEEP_SECONDS', '0.002')
+    result = pytester.runpytest('--lambda-baseline=record')
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(['*recorded baseline setup costs of 1 lambda fixtures*'])
+
+    result = pytester.runpytest('--lambda-baseline=check')
+    assert result.ret == 0
+
+    monkeypatch.setenv('SLEEP_SECONDS', '0.5')
+    result = pytester.runpytest('--lambda-baseline=check', '--lambda-regression-ratio=5')
+    result.assert_outcomes(passed=1)
+    assert result.ret == 1
+    result.stdout.fnmatch_lines([
+        '*regressions beyond 5x baseline:*',
+        '*test_baseline.py::sleepy: median setup *ms is *x baseline of *ms',
+    ])
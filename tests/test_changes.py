@@ -0,0 +1,171 @@
+import sys
+import textwrap
+
+import pytest
+
+from pytest_lambda import lambda_fixture
+from pytest_lambda.changes import CodeHasher
+from pytest_lambda.plugin import process_lambda_fixtures
+
+
+CHANGED_SUITE = '''
+    import pytest
+    from pytest_lambda import lambda_fixture, static_fixture
+
+    THRESHOLD = 10
+
+    def double(x):
+        return x * 2
+
+    class BaseTest:
+        base = lambda_fixture(lambda: {base!r})
+
+    class TestBase(BaseTest):
+        def test_uses_base(self, base):
+            assert base == 'base'
+
+    class TestDerived(BaseTest):
+        derived = lambda_fixture(lambda base: base + '!')
+
+        def test_uses_derived(self, derived):
+            assert derived == 'base!'
+
+    number, = lambda_fixture(params=[pytest.param(1), pytest.param(2)])
+
+    def test_number(number):
+        assert double(number) < THRESHOLD
+
+    def test_static(static):
+        assert static == 'static'
+
+    static = static_fixture('static')
+'''
+
+
+@pytest.fixture(autouse=True)
+def dont_write_bytecode(monkeypatch):
+    # Test modules are rewritten within the same second; stale bytecode must not be used
+    monkeypatch.setattr(sys, 'dont_write_bytecode', True)
+
+
+def write_suite(pytester, base='base', **replacements):
+    source = textwrap.dedent(CHANGED_SUITE).format(base=base)
+    for old, new in replacements.items():
+        source = source.replace(old, new)
+    pytester.makepyfile(test_changed=source)
+
+
+def assert_outcomes(result, deselected=0, **outcomes):
+    # (assert_outcomes() only accepts deselected on pytest>=7)
+    result.assert_outcomes(**outcomes)
+    assert result.parseoutcomes().get('deselected', 0) == deselected
+
+
+def it_deselects_tests_unchanged_since_passing(pytester):
+    write_suite(pytester)
+
+    result = pytester.runpytest('--lambda-changed')
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines(['lambda-changed: deselected 0 tests unchanged since they last passed'])
+
+    result = pytester.runpytest('--lambda-changed')
+    assert_outcomes(result, deselected=5)
+    result.stdout.fnmatch_lines(['lambda-changed: deselected 5 tests unchanged since they last passed'])
+
+
+def it_reruns_tests_depending_on_changed_fixture(pytester):
+    write_suite(pytester)
+    pytester.runpytest('--lambda-changed')
+
+    write_suite(pytester, base='based')
+    result = pytester.runpytest('--lambda-changed', '-v')
+    assert_outcomes(result, failed=2, deselected=3)
+    result.stdout.fnmatch_lines([
+        '*::TestBase::test_uses_base FAILED*',
+        '*::TestDerived::test_uses_derived FAILED*',
+    ])
+
+    # Failed tests are rerun, even when their code hasn't changed
+    result = pytester.runpytest('--lambda-changed')
+    assert_outcomes(result, failed=2, deselected=3)
+
+
+@pytest.mark.parametrize('old, new, num_rerun', [
+    pytest.param('return x * 2', 'return x * 3', 2, id='referenced-function'),
+    pytest.param('THRESHOLD = 10', 'THRESHOLD = 11', 2, id='referenced-global'),
+    pytest.param('pytest.param(2)', 'pytest.param(2.0)', 1, id='param-value'),
+])
+def it_reruns_tests_when_referenced_code_changes(pytester, old, new, num_rerun):
+    write_suite(pytester)
+    pytester.runpytest('--lambda-changed')
+
+    write_suite(pytester, **{old: new})
+    result = pytester.runpytest('--lambda-changed', '-v')
+    assert_outcomes(result, passed=num_rerun, deselected=5 - num_rerun)
+    result.stdout.fnmatch_lines(['*::test_number*PASSED*'])
+
+
+def it_reruns_tests_when_function_of_imported_module_changes(pytester):
+    pytester.makepyfile(test_imported='''
+        import helpers
+        from pytest_lambda import lambda_fixture
+
+        computed = lambda_fixture(lambda: helpers.compute(2))
+
+        def test_computed(computed):
+            assert computed > 0
+
+        def test_unrelated():
+            pass
+    ''')
+    pytester.makepyfile(helpers='def compute(x):\n    return x * 2\n')
+    pytester.syspathinsert()
+    pytester.runpytest_subprocess('--lambda-changed')
+
+    pytester.makepyfile(helpers='def compute(x):\n    return x * 3\n')
+    result = pytester.runpytest_subprocess('--lambda-changed', '-v')
+    assert_outcomes(result, passed=1, deselected=1)
+    result.stdout.fnmatch_lines(['*::test_computed PASSED*'])
+
+
+def it_ignores_moved_code(pytester):
+    write_suite(pytester)
+    pytester.runpytest('--lambda-changed')
+
+    write_suite(pytester, **{'THRESHOLD = 10': '\n\n\nTHRESHOLD = 10'})
+    result = pytester.runpytest('--lambda-changed')
+    assert_outcomes(result, deselected=5)
+
+
+def it_does_not_deselect_without_option(pytester):
+    write_suite(pytester)
+    pytester.runpytest('--lambda-changed')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=5)
+
+
+class DescribeCodeHasher:
+    hasher = lambda_fixture(lambda: CodeHasher())
+
+    def it_ignores_line_numbers(self, hasher):
+        first = eval('lambda x: x + 1')
+        second = eval('\n\n(lambda x:\n  x + 1)')
+        assert hasher.hash_value(first) == hasher.hash_value(second)
+
+    def it_hashes_closure_contents(self, hasher):
+        def make(value):
+            return lambda: value
+
+        assert hasher.hash_value(make(1)) == hasher.hash_value(make(1))
+        assert hasher.hash_value(make(1)) != hasher.hash_value(make(2))
+
+    def it_hashes_lazy_param_factories(self, hasher):
+        def make(value):
+            class TestLazy:
+                lazy = lambda_fixture(params=[lambda: value], lazy=True)
+            process_lambda_fixtures(TestLazy)
+            return TestLazy.lazy
+
+        assert hasher.hash_value(make(1)) == hasher.hash_value(make(1))
+        assert hasher.hash_value(make(1)) != hasher.hash_value(make(2))
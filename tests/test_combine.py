@@ -0,0 +1,116 @@
+import itertools
+
+import pytest
+
+from pytest_lambda.combinatorics import covering_array
+
+
+class DescribeCoveringArray:
+
+    @pytest.mark.parametrize('sizes, strength', [
+        ([3, 3, 3, 3], 2),
+        ([2] * 10, 2),
+        ([5, 4, 3, 2, 6], 2),
+        ([3, 3, 3, 3, 3], 3),
+        ([4, 1, 3], 2),
+    ])
+    def it_covers_every_combination_of_strength_factors(self, sizes, strength):
+        rows = covering_array(sizes, strength)
+
+        for factors in itertools.combinations(range(len(sizes)), strength):
+            expected = set(itertools.product(*(range(sizes[f]) for f in factors)))
+            actual = {tuple(row[f] for f in factors) for row in rows}
+            assert expected <= actual
+
+    def it_returns_full_product_when_strength_covers_all_factors(self):
+        expected = list(itertools.product(range(2), range(3)))
+        actual = covering_array([2, 3], 2)
+        assert expected == actual
+
+
+COMBINED_SUITE = '''
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    a, b = lambda_fixture(params=[pytest.param(i, -i, id=f'ab{i}') for i in range(4)], combine='pairwise')
+    c, = lambda_fixture(params=[pytest.param(i, id=f'c{i}') for i in range(4)])
+    d, = lambda_fixture(params=[pytest.param(i, id=f'd{i}') for i in range(4)])
+
+    def test_it(a, b, c, d):
+        assert b == -a
+'''
+
+
+def it_parametrizes_with_pairwise_covering_array(pytester):
+    pytester.makepyfile(test_combined=COMBINED_SUITE)
+
+    result = pytester.runpytest('--collect-only', '-q')
+    nodeids = [line for line in result.outlines if line.startswith('test_combined.py::')]
+    assert 4 * 4 <= len(nodeids) < 4 * 4 * 4
+
+    result.stdout.fnmatch_lines([
+        f'lambda-combine: 1 test functions parametrized with {len(nodeids)} of 64 combinations*',
+    ])
+
+    # Ids must be stable between runs (and thus xdist workers)
+    second_result = pytester.runpytest('--collect-only', '-q')
+    second_nodeids = [line for line in second_result.outlines if line.startswith('test_combined.py::')]
+    assert nodeids == second_nodeids
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=len(nodeids))
+
+
+def it_uses_full_product_by_default(pytester):
+    pytester.makepyfile(test_combined=COMBINED_SUITE.replace(", combine='pairwise'", ''))
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=64)
+    result.stdout.no_fnmatch_line('lambda-combine:*')
+
+
+def it_uses_ini_combine_mode(pytester):
+    pytester.makeini('''
+        [pytest]
+        lambda_combine = 3
+    ''')
+    pytester.makepyfile(test_combined=COMBINED_SUITE.replace(", combine='pairwise'", ''))
+
+    # 3-wise over 3 param sources is the full product
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=64)
+
+
+MIXED_SCOPES_SUITE = '''
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    db, = lambda_fixture(params=[pytest.param(i, id=f'db{i}') for i in range(3)], scope='module')
+    connection = lambda_fixture(lambda db: f'conn-{db}', scope='module')
+    c, = lambda_fixture(params=[pytest.param(i, id=f'c{i}') for i in range(3)])
+    d, = lambda_fixture(params=[pytest.param(i, id=f'd{i}') for i in range(3)])
+    e, = lambda_fixture(params=[pytest.param(i, id=f'e{i}') for i in range(3)])
+
+    def test_it(connection, c, d, e):
+        assert connection.startswith('conn-')
+'''
+
+
+def it_combines_param_sources_of_each_scope_separately(pytester):
+    pytester.makeini('''
+        [pytest]
+        lambda_combine = pairwise
+    ''')
+    pytester.makepyfile(test_combined_scopes=MIXED_SCOPES_SUITE)
+
+    result = pytester.runpytest('--collect-only', '-q')
+    nodeids = [line for line in result.outlines if line.startswith('test_combined_scopes.py::')]
+    # The module-scoped db is combined with the pairwise combinations of the others
+    assert 3 * 9 <= len(nodeids) < 3 * 27
+    result.stdout.fnmatch_lines([
+        f'lambda-combine: 1 test functions parametrized with {len(nodeids)} of 81 combinations*',
+    ])
+
+    # (The module-scoped connection fixture requires db to be parametrized at module scope)
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=len(nodeids))
@@ -0,0 +1,82 @@
+FAILFAST_SUITE = '''
+    import pytest
+    from pytest_lambda import disabled_fixture, lambda_fixture, not_implemented_fixture
+
+    SETUPS = []
+
+    expensive = lambda_fixture(lambda: SETUPS.append('expensive'))
+    wheelchair = disabled_fixture()
+
+    def test_stairs(expensive, wheelchair):
+        pass
+
+    class TestBase:
+        route = not_implemented_fixture()
+        url = lambda_fixture(lambda expensive, route: f'/{route}')
+
+        def test_url(self, url):
+            assert url.startswith('/')
+
+        class TestNested:
+            def test_nested_url(self, url):
+                assert url.startswith('/')
+
+    class TestUsers(TestBase):
+        route = lambda_fixture(lambda: 'users')
+
+    class TestForgetful(TestBase):
+        pass
+
+    class TestAlias:
+        wheelchair = lambda_fixture(lambda wheelchair: 'overridden')
+
+        def test_still_disabled(self, wheelchair):
+            pass
+
+    class TestOverridden:
+        wheelchair = lambda_fixture(lambda: 'crutches')
+
+        def test_not_disabled(self, wheelchair):
+            assert wheelchair == 'crutches'
+
+    def test_nothing_was_set_up():
+        assert SETUPS.count('expensive') == 2  # (for TestUsers and its nested class)
+'''
+
+
+def it_fails_fast_on_disabled_and_unimplemented_fixtures(pytester):
+    pytester.makepyfile(test_failfast_suite=FAILFAST_SUITE)
+
+    result = pytester.runpytest('-v', '-p', 'no:randomly')
+    result.assert_outcomes(passed=4, errors=4)
+    assert result.parseoutcomes()['deselected'] == 2
+    result.stdout.fnmatch_lines_random([
+        'lambda-failfast: deselected 2 tests of abstract classes; 4 tests use disabled or unimplemented fixtures',
+        '*::test_stairs ERROR*',
+        '*::TestUsers::test_url PASSED*',
+        '*::TestUsers::TestNested::test_nested_url PASSED*',
+        '*::TestForgetful::test_url ERROR*',
+        '*::TestForgetful::TestNested::test_nested_url ERROR*',
+        '*::TestAlias::test_still_disabled ERROR*',
+        '*::TestOverridden::test_not_disabled PASSED*',
+        '*::test_nothing_was_set_up PASSED*',
+        '*DisabledFixtureError: Usage of the wheelchair fixture has been disabled*',
+        '*NotImplementedFixtureError: Please define/override the route fixture*',
+    ])
+    result.stdout.no_fnmatch_line('*::TestBase::*')
+
+
+def it_still_applies_xfail_to_failing_fast_tests(pytester):
+    pytester.makepyfile(test_failfast_xfail='''
+        import pytest
+        from pytest_lambda import disabled_fixture
+
+        wheelchair = disabled_fixture()
+
+        @pytest.mark.xfail(strict=True)
+        def test_stairs(wheelchair):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(xfailed=1)
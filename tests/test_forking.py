@@ -0,0 +1,155 @@
+import os
+
+import pytest
+
+from pytest_lambda.compat import PYTEST_VERSION
+
+pytestmark = [
+    pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork()'),
+    pytest.mark.skipif(PYTEST_VERSION < (7, 0), reason='requires pytest>=7.0'),
+]
+
+
+FORKED_SUITE = '''
+    import os
+    import time
+    import pytest
+    from pytest_lambda import fork_fixture, lambda_fixture
+
+    BUILDS = []
+    MAIN_PID = os.getpid()
+
+    graph = fork_fixture(lambda: BUILDS.append(1) or {{'nodes': list(range(10))}}, max_workers={max_workers})
+    nodes = lambda_fixture(lambda graph: graph['nodes'])
+
+    @pytest.mark.parametrize('i', range(4))
+    def test_mutates_in_child(graph, i):
+        assert len(graph['nodes']) == 10
+        graph['nodes'].clear()
+        assert os.getpid() != MAIN_PID
+        time.sleep({sleep})
+
+    def test_mutates_through_dependent(nodes):
+        nodes.append(10)
+        assert len(nodes) == 11
+
+    def test_fails(graph):
+        print('output of failing test')
+        assert False
+
+    def test_crashes(graph):
+        os._exit(3)
+
+    def test_runs_in_main_process():
+        assert os.getpid() == MAIN_PID
+        assert BUILDS == [1]
+'''
+
+
+def it_runs_each_test_in_forked_child(pytester):
+    pytester.makepyfile(test_forked=FORKED_SUITE.format(max_workers=None, sleep=0))
+
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=6, failed=2)
+    result.stdout.fnmatch_lines([
+        '*Captured stdout call*',
+        'output of failing test',
+        '*test_crashes*',
+        'Forked test process crashed with exit code 3',
+    ])
+
+
+def it_runs_children_concurrently_up_to_max_workers(pytester):
+    pytester.makepyfile(test_forked=FORKED_SUITE.format(max_workers=4, sleep=1))
+
+    result = pytester.runpytest_subprocess('-k', 'test_mutates_in_child')
+    result.assert_outcomes(passed=4, deselected=4)
+    # Run one at a time, these tests would take at least 4s
+    assert result.duration < 3
+
+
+def it_uses_ini_max_workers(pytester):
+    pytester.makeini('''
+        [pytest]
+        lambda_fork_workers = 4
+    ''')
+    pytester.makepyfile(test_forked=FORKED_SUITE.format(max_workers=None, sleep=1))
+
+    result = pytester.runpytest_subprocess('-k', 'test_mutates_in_child')
+    result.assert_outcomes(passed=4, deselected=4)
+    assert result.duration < 3
+
+
+def it_runs_with_xdist(pytester):
+    pytest.importorskip('xdist')
+    pytester.makepyfile(test_forked=FORKED_SUITE.format(max_workers=4, sleep=0))
+
+    # Each xdist worker builds its own graph, so build counts differ between workers
+    result = pytester.runpytest_subprocess('-n', '2', '-k', 'not test_runs_in_main_process')
+    result.assert_outcomes(passed=5, failed=2)
+
+
+def it_raises_instead_of_hanging_on_background_loop_values(pytester):
+    pytester.makepyfile(test_forked_background='''
+        import asyncio
+        import pytest
+        from pytest_lambda import fork_fixture, lambda_fixture
+
+        class Client:
+            async def ping(self):
+                await asyncio.sleep(0)
+                return 'pong'
+
+        client = lambda_fixture(lambda: Client(), background_loop=True, scope='session')
+        forked = fork_fixture(lambda client: client)
+
+        def test_uses_loop_in_child(forked):
+            with pytest.raises(RuntimeError, match='started in another process'):
+                forked.ping()
+    ''')
+
+    result = pytester.runpytest_subprocess(timeout=30)
+    result.assert_outcomes(passed=1)
+
+
+def it_runs_tests_using_fork_fixtures_from_conftest_in_forked_child(pytester):
+    pytester.makeconftest('''
+        from pytest_lambda import fork_fixture
+
+        graph = fork_fixture(lambda: {'nodes': list(range(10))})
+    ''')
+    pytester.makepyfile(test_forked_conftest='''
+        import os
+
+        MAIN_PID = os.getpid()
+
+        def test_forked(graph):
+            graph['nodes'].clear()
+            assert os.getpid() != MAIN_PID
+
+        def test_gets_own_copy(graph):
+            assert len(graph['nodes']) == 10
+            assert os.getpid() != MAIN_PID
+
+        def test_runs_in_main_process():
+            assert os.getpid() == MAIN_PID
+    ''')
+
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(passed=3)
+
+
+def it_reports_skips_of_higher_scoped_fixtures(pytester):
+    pytester.makepyfile(test_forked_skip='''
+        import pytest
+        from pytest_lambda import fork_fixture, lambda_fixture
+
+        unavailable = lambda_fixture(lambda: pytest.skip('unavailable'), scope='session')
+        forked = fork_fixture(lambda unavailable: unavailable)
+
+        def test_skipped(forked):
+            pass
+    ''')
+
+    result = pytester.runpytest_subprocess()
+    result.assert_outcomes(skipped=1)
@@ -0,0 +1,245 @@
+import textwrap
+import tracemalloc
+
+import pytest
+
+from pytest_lambda import lambda_fixture
+
+
+factory_calls = []
+
+
+def make_factory(value):
+    def factory():
+        factory_calls.append(value)
+        return value
+    return factory
+
+
+number = lambda_fixture(params=[make_factory(1), make_factory(2)], ids=['one', 'two'], lazy=True)
+
+
+def it_builds_each_lazy_param_with_its_factory(number, request):
+    expected = {'one': 1, 'two': 2}[request.node.callspec.id]
+    actual = number
+    assert expected == actual
+
+
+def it_parametrizes_by_param_index_only(number, request):
+    expected = {'number__lazy_index'}
+    actual = set(request.node.callspec.params)
+    assert expected == actual
+
+
+letter, count = lambda_fixture(
+    params=[
+        pytest.param(make_factory('a'), lambda: 1, id='ayy'),
+        pytest.param(make_factory('b'), lambda: 2, id='bee'),
+    ],
+    lazy=True,
+    scope='module',
+)
+
+
+def it_processes_destructured_lazy_fixture(letter, count, request):
+    expected = {'ayy': ('a', 1), 'bee': ('b', 2)}[request.node.callspec.id]
+    actual = (letter, count)
+    assert expected == actual
+
+
+def it_builds_higher_scoped_lazy_params_once_per_scope(letter, count):
+    expected = 1
+    actual = factory_calls.count(letter)
+    assert expected == actual
+
+
+def it_requires_params_for_lazy():
+    with pytest.raises(ValueError):
+        lambda_fixture(lazy=True)
+
+
+RELEASE_SUITE = '''
+    import gc
+    import weakref
+
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    class Payload(list):
+        pass
+
+    REFS = []
+
+    def build_payload():
+        payload = Payload(range(1000))
+        REFS.append(weakref.ref(payload))
+        return payload
+
+    class TestUsesPayload:
+        payload, size = lambda_fixture(
+            params=[pytest.param(build_payload, lambda: 1000, id=f'p{i}') for i in range(3)],
+            lazy=True,
+            scope='class',
+        )
+
+        def test_payload(self, payload, size):
+            assert len(payload) == size
+
+    def test_released_after_teardown():
+        gc.collect()
+        assert len(REFS) == 3
+        assert all(ref() is None for ref in REFS)
+'''
+
+
+def it_releases_lazy_params_after_teardown(pytester):
+    pytester.makepyfile(test_lazy_release=RELEASE_SUITE)
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=4)
+
+
+BENCHMARK_SUITE = '''
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    PARAM_BYTES = {param_bytes}
+
+    payload, num_bytes = lambda_fixture(
+        params=[
+            {param}
+            for i in range(50)
+        ],
+        lazy={lazy},
+    )
+
+    def test_payload(payload, num_bytes):
+        assert len(payload) == num_bytes
+'''
+
+BENCHMARK_CONFTEST = '''
+    import tracemalloc
+
+    def pytest_collection_finish(session):
+        session.config.collected_bytes = tracemalloc.get_traced_memory()[0]
+'''
+
+
+def measure_collection_bytes(pytester, *, lazy: bool, param_bytes: int) -> int:
+    if lazy:
+        param = "pytest.param(lambda: bytes(PARAM_BYTES), lambda: PARAM_BYTES, id=f'p{i}')"
+    else:
+        param = "pytest.param(bytes(PARAM_BYTES), PARAM_BYTES, id=f'p{i}')"
+
+    pytester.makeconftest(BENCHMARK_CONFTEST)
+    path = pytester.makepyfile(**{
+        f'test_benchmark_{"lazy" if lazy else "eager"}_{param_bytes}':
+            BENCHMARK_SUITE.format(param_bytes=param_bytes, param=param, lazy=lazy),
+    })
+
+    baseline = tracemalloc.get_traced_memory()[0]
+    reprec = pytester.inline_run(path, '--collect-only', '-p', 'no:cacheprovider')
+    return reprec.getcall('pytest_collection_finish').session.config.collected_bytes - baseline
+
+
+@pytest.fixture
+def traced_memory():
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    yield
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def it_keeps_collection_memory_flat_regardless_of_param_size(pytester, traced_memory):
+    small, large = 1_000, 200_000
+
+    eager_growth = (
+        measure_collection_bytes(pytester, lazy=False, param_bytes=large)
+        - measure_collection_bytes(pytester, lazy=False, param_bytes=small)
+    )
+    lazy_growth = (
+        measure_collection_bytes(pytester, lazy=True, param_bytes=large)
+        - measure_collection_bytes(pytester, lazy=True, param_bytes=small)
+    )
+
+    # 50 eagerly-built params of 200KB are held through collection (~10MB) ...
+    assert eager_growth > 50 * (large - small) * 0.9
+    # ... whereas lazy params cost the same, no matter their size
+    assert abs(lazy_growth) < 500_000
+
+
+def it_supports_lazy_fixtures_imported_into_several_modules(pytester):
+    pytester.makepyfile(shared_lazies='''
+        import pytest
+        from pytest_lambda import lambda_fixture
+
+        number = lambda_fixture(params=[lambda: 1, lambda: 2], lazy=True)
+        big, size = lambda_fixture(
+            params=[pytest.param(lambda: bytes(10), lambda: 10, id='ten')],
+            lazy=True,
+        )
+    ''')
+    for module_name in ('test_first_importer', 'test_second_importer'):
+        pytester.makepyfile(**{module_name: '''
+            from shared_lazies import number, big, size
+
+            def test_number(number):
+                assert number in (1, 2)
+
+            def test_destructured(big, size):
+                assert len(big) == size
+        '''})
+    pytester.syspathinsert()
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=6)
+
+
+def it_supports_lazy_fixtures_declared_in_conftest(pytester):
+    pytester.makeconftest('''
+        from pytest_lambda import lambda_fixture
+
+        number = lambda_fixture(params=[lambda: 1, lambda: 2], lazy=True)
+    ''')
+    pytester.makepyfile(test_root='''
+        def test_number(number):
+            assert number in (1, 2)
+    ''')
+    # Conftests of subdirectories are only registered during collection
+    pytester.mkpydir('sub')
+    pytester.path.joinpath('sub', 'conftest.py').write_text(textwrap.dedent('''
+        import pytest
+        from pytest_lambda import lambda_fixture
+
+        big, size = lambda_fixture(
+            params=[pytest.param(lambda: bytes(10), lambda: 10, id='ten')],
+            lazy=True,
+        )
+    '''))
+    pytester.path.joinpath('sub', 'test_sub.py').write_text(textwrap.dedent('''
+        def test_destructured(number, big, size):
+            assert len(big) == size
+    '''))
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=4)
+
+
+def it_errors_for_lazy_fixtures_declared_elsewhere(pytester):
+    pytester.makepyfile(lazy_plugin='''
+        from pytest_lambda import lambda_fixture
+
+        number = lambda_fixture(params=[lambda: 1], lazy=True)
+    ''')
+    pytester.makepyfile(test_plugin_user='''
+        pytest_plugins = ['lazy_plugin']
+
+        def test_number(number):
+            pass
+    ''')
+    pytester.syspathinsert()
+
+    result = pytester.runpytest()
+    result.assert_outcomes(errors=1)
+    result.stdout.fnmatch_lines(["*Lambda fixture 'number' must be declared in a test module*"])
@@ -1,6 +1,7 @@
 import pytest
 
 from pytest_lambda import lambda_fixture, static_fixture
+from pytest_lambda.plugin import process_lambda_fixtures
 
 
 unique = lambda_fixture(lambda: 'unique')
@@ -78,3 +79,41 @@ class TestClass:
         expected = 'a'
         actual = a
         assert expected == actual
+
+
+def it_binds_fixture_to_first_class_it_is_contributed_to():
+    class Base:
+        multiplier = 2
+        multiplied = lambda_fixture(lambda self: self.multiplier * 10, bind=True)
+
+    class Subclass(Base):
+        multiplier = 3
+
+    process_lambda_fixtures(Base)
+    process_lambda_fixtures(Subclass)
+
+    # Fixtures are only contributed to the first class they're found in
+    assert Subclass.multiplied.parent is Base
+    assert Subclass.multiplied() == 20
+
+def it_keeps_name_and_module_of_first_module_importing_fixture(pytester):
+    pytester.makepyfile(shared_fixtures='''
+        from pytest_lambda import lambda_fixture
+
+        shared = lambda_fixture(lambda: 'shared')
+    ''')
+    for module_name in ('test_first_importer', 'test_second_importer'):
+        pytester.makepyfile(**{module_name: '''
+            from shared_fixtures import shared
+
+            def test_shared(shared):
+                assert shared == 'shared'
+
+            def test_contributed_to_first_module():
+                assert shared.__name__ == 'shared'
+                assert shared.__module__ == 'test_first_importer'
+        '''})
+    pytester.syspathinsert()
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=4)
@@ -0,0 +1,61 @@
+import pstats
+
+
+def it_writes_pstats_and_collapsed_stacks_for_matching_fixtures(pytester):
+    pytester.makepyfile(test_profiled='''
+        import pytest
+        from pytest_lambda import lambda_fixture, wrap_fixture
+
+        def build_expensive():
+            return sum(range(1000))
+
+        expensive = lambda_fixture(lambda: build_expensive())
+        cheap = lambda_fixture(lambda: 1)
+
+        @pytest.fixture
+        @wrap_fixture(expensive)
+        def expensive_extended(wrapped):
+            return wrapped() + 1
+
+        @pytest.mark.parametrize('i', range(3))
+        def test_it(i, expensive, cheap, expensive_extended):
+            pass
+    ''')
+
+    result = pytester.runpytest('--lambda-profile=expensive*', '--lambda-profile-dir=profiles')
+    result.assert_outcomes(passed=3)
+
+    profiles_dir = pytester.path / 'profiles'
+    written = sorted(path.name for path in profiles_dir.iterdir())
+    assert written == [
+        'test_profiled.py_expensive.collapsed',
+        'test_profiled.py_expensive.pstats',
+        'test_profiled.py_expensive_extended.collapsed',
+        'test_profiled.py_expensive_extended.pstats',
+    ]
+
+    # Repeated setups are aggregated into a single profile
+    stats = pstats.Stats(str(profiles_dir / 'test_profiled.py_expensive.pstats'))
+    call_counts = {
+        funcname: func_stats[1]
+        for (_, _, funcname), func_stats in stats.stats.items()
+    }
+    assert call_counts['build_expensive'] == 3
+
+    collapsed = (profiles_dir / 'test_profiled.py_expensive.collapsed').read_text()
+    assert 'build_expensive (test_profiled.py:' in collapsed
+
+
+def it_does_not_profile_without_option(pytester):
+    pytester.makepyfile(test_unprofiled='''
+        from pytest_lambda import lambda_fixture
+
+        expensive = lambda_fixture(lambda: 1)
+
+        def test_it(expensive):
+            pass
+    ''')
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+    assert not (pytester.path / 'lambda-profiles').exists()
@@ -0,0 +1,75 @@
+import re
+
+REORDERED_SUITE = '''
+    import time
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    EXPENSIVE_SETUPS = []
+
+    a, = lambda_fixture(params=[pytest.param(1), pytest.param(2), pytest.param(3)], scope='module')
+    x, = lambda_fixture(params=[pytest.param('p'), pytest.param('q')], scope='module')
+
+    expensive_a = lambda_fixture(lambda a: EXPENSIVE_SETUPS.append(a) or time.sleep(0.01), scope='module')
+    cheap_x = lambda_fixture(lambda x: None, scope='module')
+
+    def test_it(x, cheap_x, expensive_a):
+        pass
+
+    def test_count_expensive_setups():
+        print(f'*EXPENSIVE_SETUPS={len(EXPENSIVE_SETUPS)}')
+'''
+
+
+def get_expensive_setups(result) -> int:
+    match = re.search(r'\*EXPENSIVE_SETUPS=(\d+)', result.stdout.str())
+    assert match is not None
+    return int(match.group(1))
+
+
+def it_groups_tests_by_expensive_fixture_params(pytester):
+    pytester.makepyfile(test_reordered=REORDERED_SUITE)
+
+    # Without setup costs from a previous run, every fixture is weighed equally
+    result = pytester.runpytest('-s', '--lambda-reorder')
+    result.assert_outcomes(passed=7)
+
+    result = pytester.runpytest('-s', '--lambda-reorder')
+    result.assert_outcomes(passed=7)
+    result.stdout.fnmatch_lines([
+        'lambda-reorder: * setups of parametrized lambda fixtures (saved * in original order, est. *ms)',
+        '*EXPENSIVE_SETUPS=3*',
+    ])
+
+
+def it_keeps_tests_without_param_sources_in_place(pytester):
+    pytester.makepyfile(test_reordered=REORDERED_SUITE)
+
+    pytester.runpytest('--lambda-reorder')
+    result = pytester.runpytest('-v', '--lambda-reorder')
+    result.assert_outcomes(passed=7)
+    passed = [line for line in result.outlines if ' PASSED' in line]
+    assert passed[-1].startswith('test_reordered.py::test_count_expensive_setups PASSED')
+
+
+def it_does_not_reorder_without_option(pytester):
+    pytester.makepyfile(test_reordered=REORDERED_SUITE)
+
+    pytester.runpytest('--lambda-reorder')
+    result = pytester.runpytest('-s')
+    result.assert_outcomes(passed=7)
+    assert get_expensive_setups(result) > 3
+    result.stdout.no_fnmatch_line('lambda-reorder:*')
+
+
+def it_groups_tests_by_expensive_lazy_fixture_params(pytester):
+    suite = REORDERED_SUITE.replace(
+        "a, = lambda_fixture(params=[pytest.param(1), pytest.param(2), pytest.param(3)], scope='module')",
+        "a, = lambda_fixture(params=[pytest.param(lambda i=i: i) for i in (1, 2, 3)], lazy=True, scope='module')",
+    )
+    pytester.makepyfile(test_reordered_lazy=suite)
+
+    pytester.runpytest('--lambda-reorder')
+    result = pytester.runpytest('-s', '--lambda-reorder')
+    result.assert_outcomes(passed=7)
+    result.stdout.fnmatch_lines(['*EXPENSIVE_SETUPS=3*'])
@@ -0,0 +1,104 @@
+import importlib.util
+
+import pytest
+
+# NOTE: importorskip() at module level errors (rather than skips) on pytest<6, as lambda
+#       fixtures are processed while the module is imported by a collection hook
+pytestmark = pytest.mark.skipif(importlib.util.find_spec('xdist') is None, reason='requires pytest-xdist')
+
+
+AFFINITY_SUITE = '''
+    import os
+    import time
+    import pytest
+    from pytest_lambda import lambda_fixture
+
+    def build_expensive():
+        with open('setups.log', 'a') as fp:
+            fp.write(os.environ['PYTEST_XDIST_WORKER'] + '\\n')
+        time.sleep(0.05)
+
+    expensive = lambda_fixture(lambda: build_expensive(), scope='module')
+
+    @pytest.mark.parametrize('i', range(8))
+    def test_expensive(i, expensive):
+        time.sleep(0.01)
+
+    @pytest.mark.parametrize('i', range(32))
+    def test_cheap(i):
+        time.sleep(0.01)
+'''
+
+
+def it_sends_tests_sharing_expensive_fixture_to_same_worker(pytester):
+    pytester.makepyfile(test_affinity=AFFINITY_SUITE)
+    setups_log = pytester.path / 'setups.log'
+
+    # The first run records fixture usage and setup costs
+    result = pytester.runpytest_subprocess('-n', '4', '--lambda-affinity')
+    result.assert_outcomes(passed=40)
+
+    setups_log.unlink()
+    result = pytester.runpytest_subprocess('-n', '4', '--lambda-affinity')
+    result.assert_outcomes(passed=40)
+    assert len(setups_log.read_text().splitlines()) == 1
+
+
+def it_balances_load_by_splitting_large_groups(pytester):
+    pytester.makepyfile(test_affinity=AFFINITY_SUITE.replace('range(32)', 'range(0)'))
+    setups_log = pytester.path / 'setups.log'
+
+    pytester.runpytest_subprocess('-n', '4', '--lambda-affinity')
+
+    setups_log.unlink()
+    result = pytester.runpytest_subprocess('-n', '4', '--lambda-affinity')
+    result.assert_outcomes(passed=8, skipped=1)  # (empty parametrization of test_cheap)
+    # 8 tests sharing the fixture, split into groups of at most 3 (9 items / 4 workers)
+    assert len(setups_log.read_text().splitlines()) == 3
+
+
+def it_leaves_other_dist_modes_to_xdist(pytester):
+    pytester.makepyfile(test_affinity_each='''
+        def test_on_each_worker():
+            pass
+    ''')
+
+    result = pytester.runpytest_subprocess('-n', '2', '--dist=each', '--lambda-affinity')
+    result.assert_outcomes(passed=2)
+    assert result.parseoutcomes()['warnings'] == 1
+    result.stdout.fnmatch_lines(['*--lambda-affinity only applies to --dist=load/loadscope*'])
+
+
+def it_sends_tests_sharing_expensive_fixture_param_to_same_worker(pytester):
+    pytester.makepyfile(test_affinity_params='''
+        import os
+        import time
+        import pytest
+        from pytest_lambda import lambda_fixture
+
+        kind, = lambda_fixture(params=[pytest.param('red'), pytest.param('blue')], scope='module')
+
+        def build_expensive(kind):
+            with open('setups.log', 'a') as fp:
+                fp.write(f"{os.environ['PYTEST_XDIST_WORKER']} {kind}\\n")
+            time.sleep(0.05)
+
+        expensive = lambda_fixture(lambda kind: build_expensive(kind), scope='module')
+
+        @pytest.mark.parametrize('i', range(4))
+        def test_expensive(i, expensive):
+            time.sleep(0.01)
+
+        @pytest.mark.parametrize('i', range(32))
+        def test_cheap(i):
+            time.sleep(0.01)
+    ''')
+    setups_log = pytester.path / 'setups.log'
+
+    pytester.runpytest_subprocess('-n', '4', '--lambda-affinity')
+
+    setups_log.unlink()
+    result = pytester.runpytest_subprocess('-n', '4', '--lambda-affinity')
+    result.assert_outcomes(passed=40)
+    # One setup per param
+    assert len(setups_log.read_text().splitlines()) == 2
@@ -0,0 +1,248 @@
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_lambda import batch_fixture, lambda_fixture
+from pytest_lambda.costs import SetupCostRecorder
+from pytest_lambda.plugin import process_lambda_fixtures
+from pytest_lambda.profiling import LambdaFixtureProfiler
+from pytest_lambda.tracing import LambdaFixtureTracer
+
+NUM_THREADS = 16
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    # Switch threads as often as possible, to provoke races
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def run_concurrently(fn, num_threads=NUM_THREADS):
+    """Call fn(index) from num_threads threads at once, returning results/exceptions"""
+    barrier = threading.Barrier(num_threads)
+
+    def run(index):
+        barrier.wait()
+        try:
+            return fn(index)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(num_threads) as executor:
+        return list(executor.map(run, range(num_threads)))
+
+
+def it_contributes_to_only_the_first_parent_concurrently():
+    fixture = lambda_fixture(lambda: 'value')
+    classes = [type(f'TestClass{i}', (), {'shared': fixture}) for i in range(NUM_THREADS)]
+
+    run_concurrently(lambda i: fixture.contribute_to_parent(classes[i], 'shared'))
+
+    assert fixture.finalized
+    assert fixture.parent in classes
+    assert fixture.__name__ == fixture.fixture_func.__name__ == 'shared'
+    with pytest.raises(RuntimeError):
+        fixture.set_fixture_func(lambda: 'changed')
+
+
+@pytest.mark.parametrize('attr, value', [
+    ('fixture_kwargs', {'scope': 'session'}),
+    ('parent', object),
+    ('bind', True),
+    ('budget_ms', 1.0),
+    ('finalized', False),
+])
+def it_blocks_changes_once_finalized(attr, value):
+    class TestFinalized:
+        fixture = lambda_fixture(lambda: 'value')
+
+    process_lambda_fixtures(TestFinalized)
+    fixture = TestFinalized.fixture
+
+    with pytest.raises(RuntimeError, match='has been finalized'):
+        setattr(fixture, attr, value)
+    assert getattr(fixture, attr) != value
+
+
+def it_destructures_only_once_concurrently():
+    source = lambda_fixture(params=[pytest.param(1, 2), pytest.param(3, 4)])
+
+    def destructure(i):
+        a, b = source
+        return a, b
+
+    results = run_concurrently(destructure)
+
+    destructured = [r for r in results if not isinstance(r, Exception)]
+    assert len(destructured) == 1
+    assert all(isinstance(r, RuntimeError) for r in results if isinstance(r, Exception))
+    assert list(destructured[0]) == source._self_iter.destructured
+
+
+def it_finalizes_destructured_batch_fixtures_processed_concurrently():
+    class TestBase:
+        user, profile = batch_fixture(
+            lambda pairs: [(f'user-{u}', f'profile-{p}') for u, p in pairs],
+            params=[pytest.param('a', 'x'), pytest.param('b', 'y')],
+        )
+
+    subclasses = [type(f'TestSub{i}', (TestBase,), {}) for i in range(NUM_THREADS)]
+
+    results = run_concurrently(lambda i: process_lambda_fixtures(subclasses[i]))
+    assert not any(isinstance(r, Exception) for r in results)
+
+    user, profile = TestBase.__dict__['user'], TestBase.__dict__['profile']
+    assert user.finalized and profile.finalized
+    assert user.parent is profile.parent
+    assert (user.__name__, profile.__name__) == ('user', 'profile')
+
+    batch = getattr(user.parent, 'user__profile__batch')
+    results = batch()
+    assert user(results, 1) == 'user-b'
+    assert profile(results, 0) == 'profile-x'
+
+
+def it_invokes_fixtures_concurrently():
+    class TestBound:
+        multiplier = 3
+        tripled = lambda_fixture(lambda self, n: n * self.multiplier, bind=True)
+        alias = lambda_fixture('tripled')
+
+    process_lambda_fixtures(TestBound)
+
+    def setup(i):
+        return [TestBound.alias(TestBound.tripled(n)) for n in range(i, i + 200)]
+
+    results = run_concurrently(setup)
+    assert results == [[n * 3 for n in range(i, i + 200)] for i in range(NUM_THREADS)]
+
+
+# Fake FixtureDefs by name, kept alive as pytest would (plugins may key caches by id)
+fake_fixturedefs = {}
+
+
+def fake_setup(plugin, name, body):
+    """Run body within the pytest_fixture_setup hookwrapper of plugin"""
+    fixturedef = fake_fixturedefs.get(name)
+    if fixturedef is None:
+        fixturedef = fake_fixturedefs.setdefault(name, SimpleNamespace(
+            func=lambda_fixture(lambda: None), baseid='', argname=name, scope='function',
+            addfinalizer=lambda finalizer: None))
+    hook = plugin.pytest_fixture_setup(fixturedef, request=None)
+    next(hook)
+    body()
+    with pytest.raises(StopIteration):
+        hook.send(SimpleNamespace(excinfo=None))
+
+
+def it_records_setup_costs_of_concurrent_setups_per_thread(pytestconfig):
+    recorder = SetupCostRecorder(pytestconfig)
+
+    def setup(i):
+        for _ in range(20):
+            fake_setup(recorder, f'outer{i}',
+                       lambda: fake_setup(recorder, f'inner{i}', lambda: time.sleep(0.001)))
+        return recorder._stack
+
+    stacks = run_concurrently(setup)
+
+    # Each thread nests its setups in a stack of its own
+    assert stacks == [[]] * NUM_THREADS
+    assert len({id(stack) for stack in stacks}) == NUM_THREADS
+
+    for i in range(NUM_THREADS):
+        assert len(recorder.samples[f'outer{i}']) == 20
+        assert len(recorder.samples[f'inner{i}']) == 20
+
+
+# (tmp_path is only available on pytest>=3.9)
+tmp_dir = lambda_fixture(lambda tmpdir: Path(str(tmpdir)))
+
+
+def it_traces_concurrent_setups_per_thread(pytestconfig, tmp_dir):
+    tracer = LambdaFixtureTracer(pytestconfig, tmp_dir / 'trace.json')
+
+    def setup(i):
+        for _ in range(20):
+            fake_setup(tracer, f'outer{i}', lambda: fake_setup(tracer, f'inner{i}', lambda: None))
+        return tracer._setup_stack
+
+    try:
+        stacks = run_concurrently(setup)
+    finally:
+        tracer.pytest_unconfigure(pytestconfig)
+
+    assert stacks == [[]] * NUM_THREADS
+    assert len({id(stack) for stack in stacks}) == NUM_THREADS
+
+    # Spans carry the details of their own fixture
+    spans = [event for event in tracer.events if event['ph'] == 'X']
+    assert len(spans) == NUM_THREADS * 20 * 2
+    assert all(span['name'] == span['args']['fixture'] for span in spans)
+
+
+
+def it_profiles_setups_of_one_thread_at_a_time(pytestconfig, tmp_dir):
+    profiler = LambdaFixtureProfiler(pytestconfig, 'profiled*', tmp_dir)
+
+    def setup(i):
+        for _ in range(20):
+            fake_setup(profiler, f'profiled{i}',
+                       lambda: fake_setup(profiler, 'unprofiled', lambda: time.sleep(0.001)))
+
+    # NOTE: with Python 3.12+, only one cProfile.Profile may be enabled at a time,
+    #       across all threads
+    results = run_concurrently(setup)
+    assert not any(isinstance(r, Exception) for r in results)
+
+    assert profiler._owner is None
+    assert profiler.profiles
+    assert 0 < sum(profiler.skipped.values()) < NUM_THREADS * 20
+
+
+def it_sets_up_fixtures_requested_from_several_threads(pytester):
+    pytester.makepyfile(test_threaded_setups='''
+        import threading
+        import time
+        from pytest_lambda import lambda_fixture
+
+        NUM_FIXTURES = 8
+
+        for i in range(NUM_FIXTURES):
+            globals()[f'slow{i}'] = lambda_fixture(
+                lambda i=i: time.sleep(0.01) or i, budget_ms=10_000)
+
+        def test_concurrent_setups(request):
+            barrier = threading.Barrier(NUM_FIXTURES)
+            results = {}
+
+            def setup(i):
+                barrier.wait()
+                results[i] = request.getfixturevalue(f'slow{i}')
+
+            threads = [threading.Thread(target=setup, args=(i,)) for i in range(NUM_FIXTURES)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert results == {i: i for i in range(NUM_FIXTURES)}
+    ''')
+
+    result = pytester.runpytest('--lambda-trace=trace.json', '--lambda-profile=slow*')
+    result.assert_outcomes(passed=1)
+
+    trace = json.loads((pytester.path / 'trace.json').read_text())
+    setups = [event for event in trace['traceEvents'] if event.get('cat') == 'setup']
+    assert sorted(span['name'] for span in setups) == sorted(f'slow{i}' for i in range(8))
+    # Each setup is traced in the thread it ran in
+    assert len({span['tid'] for span in setups}) == 8
@@ -0,0 +1,91 @@
+import json
+
+import pytest
+
+
+TRACED_SUITE = '''
+    import asyncio
+    import pytest
+    from pytest_lambda import lambda_fixture, wrap_fixture
+
+    base = lambda_fixture(scope='module', params=['a', 'b'])
+    shout = lambda_fixture(lambda base: base.upper())
+    awaited = lambda_fixture(lambda: asyncio.sleep(0, 'awaited'), async_=True)
+
+    @pytest.fixture
+    @wrap_fixture(shout)
+    def extended(wrapped):
+        return wrapped() + '!'
+
+    def test_extended(extended):
+        assert extended in ('A!', 'B!')
+
+    async def test_awaited(awaited):
+        assert awaited == 'awaited'
+'''
+
+
+def load_spans(path):
+    with open(path) as fp:
+        trace = json.load(fp)
+    return [event for event in trace['traceEvents'] if event['ph'] == 'X']
+
+
+def it_writes_spans_in_chrome_trace_format(pytester):
+    pytester.makeini('''
+        [pytest]
+        asyncio_mode = auto
+    ''')
+    pytester.makepyfile(test_traced=TRACED_SUITE)
+
+    result = pytester.runpytest('--lambda-trace=trace.json')
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(['*spans written to *trace.json'])
+
+    spans = load_spans(pytester.path / 'trace.json')
+    summary = sorted((span['cat'], span['name'], span['args']['param_id']) for span in spans)
+    assert summary == [
+        ('await', 'awaited', None),
+        ('setup', 'awaited', None),
+        ('setup', 'base', 'a'),
+        ('setup', 'base', 'b'),
+        ('setup', 'extended', None),
+        ('setup', 'extended', None),
+        ('teardown', 'awaited', None),
+        ('teardown', 'base', 'a'),
+        ('teardown', 'base', 'b'),
+        ('teardown', 'extended', None),
+        ('teardown', 'extended', None),
+        ('wrapped', 'extended', None),
+        ('wrapped', 'extended', None),
+    ]
+
+    for span in spans:
+        assert span['dur'] >= 0
+        assert span['args']['worker'] == 'main'
+        assert span['args']['thread'] == span['tid']
+        assert span['args']['scope'] in ('module', 'function')
+
+    setups = {(span['name'], span['args']['param_id']): span for span in spans if span['cat'] == 'setup'}
+    teardowns = {(span['name'], span['args']['param_id']): span for span in spans if span['cat'] == 'teardown'}
+    for key, teardown in teardowns.items():
+        assert teardown['ts'] >= setups[key]['ts'] + setups[key]['dur']
+
+
+def it_merges_spans_from_xdist_workers(pytester):
+    pytest.importorskip('xdist')
+    pytester.makeini('''
+        [pytest]
+        asyncio_mode = auto
+    ''')
+    pytester.makepyfile(test_traced=TRACED_SUITE)
+
+    result = pytester.runpytest_subprocess('-n', '2', '--lambda-trace=trace.json')
+    result.assert_outcomes(passed=3)
+
+    with open(pytester.path / 'trace.json') as fp:
+        events = json.load(fp)['traceEvents']
+
+    process_names = {event['args']['name'] for event in events if event['name'] == 'process_name'}
+    assert {'pytest gw0', 'pytest gw1'} <= process_names
+    assert {span['args']['worker'] for span in events if span['ph'] == 'X'} <= {'gw0', 'gw1'}